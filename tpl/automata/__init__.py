@@ -0,0 +1,53 @@
+'''Автоматы из лабораторных работ: конечный автомат (fsm), детерминированный
+магазинный автомат (dpda) и перевод выражений в обратную польскую запись (rpn).
+
+Подмодули импортируются только при первом обращении к их именам, поэтому
+`from automata import DPDA` не загружает код конечных автоматов.
+Демонстрации запускаются из lab2.py, lab3.py и lab4.py.'''
+import importlib
+
+_SUBMODULES = ('fsm', 'dpda', 'rpn')
+
+_EXPORTS = {
+    'FiniteStateMachine': 'fsm',
+    'CompiledDFA': 'fsm',
+    'LazyDFA': 'fsm',
+    'SparseDFA': 'fsm',
+    'IncrementalDFA': 'fsm',
+    'BuildStats': 'fsm',
+    'EPSILON': 'fsm',
+    'DPDA': 'dpda',
+    'CompiledDPDA': 'dpda',
+    'DPDAStream': 'dpda',
+    'transitions_rpn': 'rpn',
+    'transitions_lang': 'rpn',
+    'tokenize': 'rpn',
+    'scan': 'rpn',
+    'convert_to_rpn': 'rpn',
+    'convert_to_rpn_verbose': 'rpn',
+    'evaluate_rpn': 'rpn',
+    'compile_rpn': 'rpn',
+    'compile_expression': 'rpn',
+    'evaluate': 'rpn',
+    'evaluate_rpn_columns': 'rpn',
+    'evaluate_columns': 'rpn',
+    'check_language': 'rpn',
+    'check_many': 'rpn',
+}
+
+__all__ = list(_SUBMODULES) + list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module(f'.{name}', __name__)
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(__all__)
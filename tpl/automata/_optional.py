@@ -0,0 +1,16 @@
+'''Необязательные зависимости пакета.'''
+
+_numpy = None
+
+
+def import_numpy():
+    '''NumPy нужен только векторным путям, поэтому импортируется при первом
+    обращении; без него возвращается None.'''
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+        except ImportError:
+            numpy = False
+        _numpy = numpy
+    return _numpy or None
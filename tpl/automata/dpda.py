@@ -0,0 +1,421 @@
+import codecs
+from array import array
+
+EPSILON = 'ε'  # пустой символ: во входе — ε-переход, в замене стека — ничего не помещать
+
+# итог ε-прогона из пары (состояние, вершина стека): номер состояния, в котором
+# эта вершина снимается, либо одно из значений ниже
+_STOP = -1         # прогон останавливается: нужен символ входа или отказ
+_LOOP = -2         # бесконечная цепочка ε-переходов
+_IN_PROGRESS = -3
+
+# чем закончилось чтение очередного фрагмента входа
+_DONE, _STUCK, _LOOPED = range(3)
+
+
+class DPDA:
+    def __init__(self, transitions, start_state, start_stack, final_states):
+        self.transitions = transitions
+        self.start_state = start_state
+        self.start_stack = start_stack
+        self.final_states = final_states
+        self._compiled = None
+        self._compiled_from = None
+
+    def _description(self):
+        return (dict(self.transitions), self.start_state, self.start_stack,
+                frozenset(self.final_states))
+
+    def compile(self):
+        '''Строит (заново) табличное представление автомата.'''
+        self._compiled_from = self._description()
+        self._compiled = CompiledDPDA(self)
+        return self._compiled
+
+    def _current(self):
+        '''Табличная форма текущего описания: transitions и остальные поля
+        публичны и могут меняться, поэтому перед использованием кэша описание
+        сравнивается с тем, из которого он построен (O(числа переходов)).'''
+        if self._compiled is None or self._description() != self._compiled_from:
+            self.compile()
+        return self._compiled
+
+    def accepts(self, input_string):
+        '''Проверяет, принадлежит ли цепочка языку автомата.'''
+        return self._current().accepts(input_string)
+
+    def accepts_many(self, strings):
+        '''Проверяет набор цепочек; возвращает список bool в том же порядке.'''
+        return self._current().accepts_many(strings)
+
+    def stream(self):
+        '''Начинает проверку цепочки, поступающей по частям.'''
+        return DPDAStream(self._current())
+
+    def accepts_stream(self, source, chunk_size=1 << 16, encoding='utf-8'):
+        '''Проверяет цепочку из файла или сокета, не загружая её целиком.
+
+        source — объект с read() или recv(); байты декодируются по частям,
+        так что многобайтовый символ может оказаться на границе блоков.'''
+        run = self.stream()
+        read = source.read if hasattr(source, 'read') else source.recv
+        decoder = None
+        while run.result is None:
+            chunk = read(chunk_size)
+            if not chunk:
+                break
+            if isinstance(chunk, bytes):
+                if decoder is None:
+                    decoder = codecs.getincrementaldecoder(encoding)()
+                chunk = decoder.decode(chunk)
+            run.feed(chunk)
+        if decoder is not None and run.result is None:
+            run.feed(decoder.decode(b'', final=True))
+        return run.finish()
+
+
+class DPDAStream:
+    '''Проверка цепочки, поступающей частями: состояние и стек сохраняются
+    между вызовами feed(). На конце фрагмента ε-переходы откладываются до
+    следующего символа, ведь выбор между ним и ε-переходом зависит от него.
+    Позиция отказа отсчитывается от начала всей цепочки.'''
+
+    def __init__(self, compiled):
+        self.compiled = compiled
+        self.state = compiled.start
+        self.stack = compiled._new_stack()
+        self.offset = 0
+        self.result = None
+
+    def feed(self, chunk):
+        '''Читает очередной фрагмент; возвращает None, пока ответ не ясен,
+        иначе (False, пояснение) — дальнейшие фрагменты уже не читаются.'''
+        if self.result is not None or not chunk:
+            return self.result
+        compiled = self.compiled
+        status, self.state, index = compiled._run(chunk, 0, self.state, self.stack)
+        position = self.offset + index
+        if status == _STUCK:
+            self.result = False, (f"{compiled._stuck_reason(chunk[index], self.state, self.stack)}. "
+                                  f"Позиция: {position}")
+        elif status == _LOOPED:
+            self.result = False, (f"{compiled._loop_reason(self.state, self.stack)}. "
+                                  f"Позиция: {position}")
+        self.offset = position
+        return self.result
+
+    def finish(self):
+        '''Сообщает о конце входа; возвращает (допущена, пояснение).'''
+        if self.result is None:
+            self.result = self.compiled._finish(self.state, self.stack)
+        return self.result
+
+
+class CompiledDPDA:
+    '''ДМП-автомат с пронумерованными состояниями, входными и магазинными
+    символами. Переход (q, x, Z) хранится в table[(q * n_inputs + x) * n_stack + Z]
+    как номер действия или -1; входной символ 0 — ε, последний — любой символ
+    вне алфавита. Действие — пара (новое состояние, кортеж помещаемых символов
+    в порядке добавления в стек).
+
+    loops в той же раскладке отмечает пары, из которых ε-переходы никогда не
+    прекращаются, если следующий символ входа x (x = 0 — конец входа). Все
+    остальные ε-прогоны конечны, поэтому ограничение на число шагов не нужно.'''
+
+    def __init__(self, dpda):
+        states = [dpda.start_state]
+        stack_symbols = [dpda.start_stack]
+        inputs = [EPSILON]
+        for (state, char, top), (new_state, replacement) in dpda.transitions.items():
+            for name in (state, new_state):
+                if name not in states:
+                    states.append(name)
+            if char not in inputs:
+                inputs.append(char)
+            for symbol in top + replacement:
+                if symbol != EPSILON and symbol not in stack_symbols:
+                    stack_symbols.append(symbol)
+        for state in dpda.final_states:
+            if state not in states:
+                states.append(state)
+
+        self.states = states
+        self.stack_symbols = stack_symbols
+        self.inputs = inputs
+        state_index = {state: i for i, state in enumerate(states)}
+        stack_index = {symbol: i for i, symbol in enumerate(stack_symbols)}
+        self.input_index = {char: i for i, char in enumerate(inputs) if i}
+        self.other_input = len(inputs)
+        self.n_inputs = len(inputs) + 1
+        self.n_stack = len(stack_symbols)
+
+        self.table = [-1] * (len(states) * self.n_inputs * self.n_stack)
+        self.actions = []
+        self.moves = []
+        input_index = {char: i for i, char in enumerate(inputs)}
+        for (state, char, top), (new_state, replacement) in dpda.transitions.items():
+            push = tuple(stack_index[symbol] for symbol in reversed(replacement)
+                         if symbol != EPSILON)
+            key = ((state_index[state] * self.n_inputs + input_index[char]) * self.n_stack
+                   + stack_index[top])
+            self.table[key] = len(self.actions)
+            self.actions.append((state_index[new_state], push))
+            self.moves.append(_run_length_move(state_index[new_state], stack_index[top], push))
+
+        self.start = 0
+        self.start_stack = 0
+        self.final = bytearray(len(states))
+        for state in dpda.final_states:
+            self.final[state_index[state]] = 1
+        self.loops = self._epsilon_loops()
+
+    def _epsilon_loops(self):
+        loops = bytearray(len(self.table))
+        n_stack = self.n_stack
+        for x in range(self.n_inputs):
+            memo = {}
+            for q in range(len(self.states)):
+                for top in range(n_stack):
+                    if self._epsilon_effect(x, q, top, memo) == _LOOP:
+                        loops[(q * self.n_inputs + x) * n_stack + top] = 1
+        return loops
+
+    def _epsilon_effect(self, x, q, top, memo):
+        '''Итог ε-прогона из (q, top) при следующем символе входа x (0 — конец).
+
+        Кадр обхода: [пара, помещённые символы, сколько ещё не снято, текущее
+        состояние]. Повторный вход в пару, чей прогон ещё идёт, означает
+        бесконечный цикл: стек ниже неё не тронут, и всё повторится.'''
+        table, actions, final = self.table, self.actions, self.final
+        n_inputs, n_stack = self.n_inputs, self.n_stack
+        frames = []
+        result = None
+        pending = (q, top)
+        while True:
+            if pending is not None:
+                q, top = pending
+                pending = None
+                key = q * n_stack + top
+                known = memo.get(key)
+                base = q * n_inputs * n_stack + top
+                if known == _IN_PROGRESS:
+                    result = _LOOP
+                elif known is not None:
+                    result = known
+                elif (final[q] if x == 0 else table[base + x * n_stack] >= 0) or table[base] < 0:
+                    result = memo[key] = _STOP
+                else:
+                    memo[key] = _IN_PROGRESS
+                    new_state, push = actions[table[base]]
+                    frames.append([key, push, len(push), new_state])
+            if not frames:
+                return result
+            frame = frames[-1]
+            if result is not None:
+                if result < 0:
+                    memo[frame[0]] = result
+                    frames.pop()
+                    continue
+                frame[3] = result
+                result = None
+            if frame[2] == 0:
+                result = memo[frame[0]] = frame[3]
+                frames.pop()
+                continue
+            frame[2] -= 1
+            pending = (frame[3], frame[1][frame[2]])
+
+    def _new_stack(self):
+        return _RunLengthStack(self.start_stack, 'B' if self.n_stack <= 256 else 'I')
+
+    def accepts(self, input_string):
+        '''Проверяет цепочку; возвращает (допущена, пояснение).'''
+        stack = self._new_stack()
+        status, state, index = self._run(input_string, 0, self.start, stack)
+        if status == _STUCK:
+            return False, (f"{self._stuck_reason(input_string[index], state, stack)}. "
+                           f"Остаток: {input_string[index:]}")
+        if status == _LOOPED:
+            return False, self._loop_reason(state, stack)
+        return self._finish(state, stack)
+
+    def accepts_many(self, strings):
+        '''Проверяет набор цепочек, разбирая общие префиксы один раз.
+
+        Цепочки обходятся в отсортированном порядке, так что соседние делят
+        самый длинный префикс. Конфигурация запоминается только на глубине
+        общего префикса со следующей цепочкой (копией массивов стека), и та
+        продолжает разбор с этого места.'''
+        strings = list(strings)
+        order = sorted(range(len(strings)), key=strings.__getitem__)
+        results = [False] * len(strings)
+        # снимки (глубина, состояние, стек); стек None — цепочка отвергнута раньше
+        snapshots = [(0, self.start, self._new_stack())]
+        previous = ''
+
+        for i, position in enumerate(order):
+            text = strings[position]
+            shared = _common_prefix(previous, text)
+            following = _common_prefix(text, strings[order[i + 1]]) if i + 1 < len(order) else 0
+            previous = text
+            while snapshots[-1][0] > shared:
+                snapshots.pop()
+            index, state, saved = snapshots[-1]
+            if saved is None:
+                continue
+            stack = saved.copy()
+            if following > index:
+                status, state, index = self._run(text, index, state, stack, following)
+                if status != _DONE:
+                    snapshots.append((following, state, None))
+                    continue
+                snapshots.append((following, state, stack.copy()))
+            status, state, index = self._run(text, index, state, stack)
+            if status == _DONE:
+                results[position] = self._finish(state, stack)[0]
+        return results
+
+    def _run(self, text, index, state, stack, stop=None):
+        '''Читает text до позиции stop (по умолчанию до конца), изменяя stack на месте.
+
+        Возвращает (итог, состояние, позиция): _DONE — прочитано до stop,
+        _STUCK — нет перехода, _LOOPED — впереди бесконечный ε-цикл.'''
+        table, moves, loops = self.table, self.moves, self.loops
+        n_inputs, n_stack = self.n_inputs, self.n_stack
+        get, other = self.input_index.get, self.other_input
+        symbols, counts = stack.symbols, stack.counts
+        length = len(text) if stop is None else stop
+
+        while index < length:
+            if not symbols:
+                return _STUCK, state, index
+            base = state * n_inputs * n_stack + symbols[-1]
+            char = get(text[index], other) * n_stack
+            action = table[base + char]
+            if action >= 0:
+                index += 1
+            else:
+                action = table[base]
+                if action < 0:
+                    return _STUCK, state, index
+                if loops[base + char]:
+                    return _LOOPED, state, index
+            # то же, что stack.apply, но без вызова метода на каждом шаге
+            state, keep, runs = moves[action]
+            if keep:
+                count = counts[-1] + keep
+                if count:
+                    counts[-1] = count
+                else:
+                    symbols.pop()
+                    counts.pop()
+            for symbol, count in runs:
+                if symbols and symbols[-1] == symbol:
+                    counts[-1] += count
+                else:
+                    symbols.append(symbol)
+                    counts.append(count)
+        return _DONE, state, index
+
+    def _finish(self, state, stack):
+        '''Доводит разбор до конца входа по ε-переходам.'''
+        table, moves, final, loops = self.table, self.moves, self.final, self.loops
+        n_inputs, n_stack = self.n_inputs, self.n_stack
+        while True:
+            # Проверка допускающего состояния
+            if final[state]:
+                return True, "Цепочка проходит"
+            if not stack:
+                break
+            base = state * n_inputs * n_stack + stack.top()
+            action = table[base]
+            if action < 0:
+                break
+            if loops[base]:
+                return False, self._loop_reason(state, stack)
+            state, keep, runs = moves[action]
+            stack.apply(keep, runs)
+        return False, "Цепочка не проходит"
+
+    def _loop_reason(self, state, stack):
+        return (f"Бесконечный цикл ε-переходов в состоянии {self.states[state]} "
+                f"при элементе в стеке {self.stack_symbols[stack.top()]}")
+
+    def _stuck_reason(self, char, state, stack):
+        top = self.stack_symbols[stack.top()] if stack else 'пустой стек'
+        return (f"Нет перехода для символа '{char}' в состоянии "
+                f"{self.states[state]} при элементе в стеке {top}")
+
+
+def _common_prefix(a, b):
+    '''Длина общего префикса: двоичный поиск со сравнением срезов.'''
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[:middle] == b[:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def _run_length_move(new_state, top, push):
+    '''Действие перехода для _RunLengthStack: (новое состояние, keep, серии).
+
+    Снимаемая вершина top известна заранее, поэтому замена вида Z -> ZZ...Z
+    сводится к изменению счётчика верхней серии на keep, а остальные
+    помещаемые символы уже сгруппированы в серии (символ, число).'''
+    runs = []
+    for symbol in push:
+        if runs and runs[-1][0] == symbol:
+            runs[-1][1] += 1
+        else:
+            runs.append([symbol, 1])
+    if runs and runs[0][0] == top:
+        keep = runs.pop(0)[1] - 1
+    else:
+        keep = -1
+    return new_state, keep, tuple((symbol, count) for symbol, count in runs)
+
+
+class _RunLengthStack:
+    '''Магазин из серий одинаковых символов: symbols[i] лежит counts[i] раз
+    подряд, вершина — последняя серия. Номера символов хранятся в array,
+    поэтому стек вида a^n занимает несколько байт вместо n ссылок, а
+    помещение и снятие символа, совпадающего с вершиной, меняет только счётчик.'''
+
+    def __init__(self, symbol, typecode='B'):
+        self.symbols = array(typecode, [symbol])
+        self.counts = array('Q', [1])
+
+    def __bool__(self):
+        return bool(self.symbols)
+
+    def __len__(self):
+        return sum(self.counts)
+
+    def top(self):
+        return self.symbols[-1]
+
+    def copy(self):
+        stack = _RunLengthStack.__new__(_RunLengthStack)
+        stack.symbols = array(self.symbols.typecode, self.symbols)
+        stack.counts = array('Q', self.counts)
+        return stack
+
+    def apply(self, keep, runs):
+        '''Выполняет действие из _run_length_move.'''
+        symbols, counts = self.symbols, self.counts
+        if keep:
+            count = counts[-1] + keep
+            if count:
+                counts[-1] = count
+            else:
+                symbols.pop()
+                counts.pop()
+        for symbol, count in runs:
+            if symbols and symbols[-1] == symbol:
+                counts[-1] += count
+            else:
+                symbols.append(symbol)
+                counts.append(count)
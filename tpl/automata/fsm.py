@@ -0,0 +1,1825 @@
+import mmap
+import struct
+import sys
+import time
+from array import array
+from bisect import bisect_left
+from collections import deque, defaultdict, OrderedDict
+from contextlib import contextmanager, nullcontext
+
+from ._optional import import_numpy as _import_numpy
+
+EPSILON = 'ε'  # символ пустого перехода: transitions[(q, EPSILON)]
+
+class FiniteStateMachine:
+    def __init__(self, states, alphabet, transitions, start_state, final_states):
+        self.states = set(states)
+        self.alphabet = set(alphabet) - {EPSILON}
+        self.transitions = transitions
+        self.start_state = start_state
+        self.final_states = set(final_states)
+
+    def is_deterministic(self):
+        for (state, symbol), next_states in self.transitions.items():
+            if symbol == EPSILON:
+                if next_states:
+                    return False
+            elif len(next_states) > 1 and symbol in self.alphabet:
+                return False
+        return True
+
+    def to_dfa(self, workers=None, stats=None):
+        return self._determinize(workers, stats).to_fsm()
+
+    def _bitsets(self, symbols):
+        '''Нумерует состояния битами: names[i] — состояние бита i.
+
+        Возвращает (names, start_mask, succ, final_mask), где succ[a][i] — маска
+        ε-замыкания всех переходов из состояния i по символу symbols[a], а
+        start_mask — ε-замыкание стартового состояния.'''
+        names = [self.start_state] + [s for s in self.states if s != self.start_state]
+        index = {state: i for i, state in enumerate(names)}
+        symbol_index = {symbol: a for a, symbol in enumerate(symbols)}
+        edges = []
+        epsilon = defaultdict(list)
+        for (state, symbol), next_states in self.transitions.items():
+            a = symbol_index.get(symbol)
+            if a is None and symbol != EPSILON:
+                continue
+            for s in [state] + list(next_states):
+                if s not in index:
+                    index[s] = len(names)
+                    names.append(s)
+            targets = [index[s] for s in next_states]
+            if a is None:
+                epsilon[index[state]].extend(targets)
+            else:
+                edges.append((a, index[state], targets))
+
+        n = len(names)
+        final_mask = 0
+        for state in self.final_states:
+            if state in index:
+                final_mask |= 1 << index[state]
+
+        if epsilon:
+            closure = _epsilon_closures(n, epsilon)
+            # недопускающие состояния только с ε-переходами на дальнейший разбор
+            # не влияют, поэтому в подмножества не попадают
+            passive = 0
+            for s in epsilon:
+                passive |= 1 << s
+            for a, s, targets in edges:
+                passive &= ~(1 << s)
+            passive &= ~final_mask
+            closure = [mask & ~passive for mask in closure]
+        else:
+            closure = [1 << i for i in range(n)]
+        succ = [[0] * n for _ in symbols]
+        for a, s, targets in edges:
+            mask = 0
+            for t in targets:
+                mask |= closure[t]
+            succ[a][s] |= mask
+        return names, closure[0], succ, final_mask
+
+    def _determinize(self, workers=None, stats=None, limit=None):
+        '''Построение подмножеств сразу в табличный CompiledDFA.
+
+        Подмножество хранится как битовая маска (int): объединение
+        последователей — OR масок, хеширование — хеш целого числа.
+        При workers > 1 фронт обхода раздаётся пулу процессов. Если
+        подмножеств становится больше limit, построение прерывается и
+        возвращается None.'''
+        with _phase(stats, 'determinize'):
+            dfa = self._determinize_masks(workers, limit)
+        if stats is not None and dfa is not None:
+            stats.peak_subsets = max(stats.peak_subsets, len(dfa))
+        return dfa
+
+    def _determinize_masks(self, workers, limit=None):
+        symbols = sorted(self.alphabet, key=str)
+        names, start, succ, final_mask = self._bitsets(symbols)
+        if workers is not None and workers > 1:
+            return _determinize_parallel(names, symbols, start, succ, final_mask, workers)
+        subset_index = {start: 0}
+        subsets = [start]
+        table = array('i')
+
+        for mask in subsets:
+            for row in succ:
+                next_mask = 0
+                m = mask
+                while m:
+                    low = m & -m
+                    next_mask |= row[low.bit_length() - 1]
+                    m ^= low
+                if not next_mask:
+                    table.append(-1)
+                    continue
+                target = subset_index.get(next_mask)
+                if target is None:
+                    if limit is not None and len(subsets) >= limit:
+                        return None
+                    target = subset_index[next_mask] = len(subsets)
+                    subsets.append(next_mask)
+                table.append(target)
+
+        final = bytearray(1 if mask & final_mask else 0 for mask in subsets)
+        states = [_mask_to_set(names, mask) for mask in subsets]
+        return CompiledDFA(states, symbols, table, 0, final)
+
+    def compile(self, workers=None, stats=None):
+        '''Переводит автомат в табличное представление (при необходимости детерминизируя).
+
+        Построение стоит O(размер ДКА), поэтому для проверки цепочек автомат
+        компилируется один раз, а дальше используются CompiledDFA.accepts,
+        accepts_many и match_stream; после изменения transitions нужно
+        вызвать compile() заново.'''
+        if not self.is_deterministic():
+            return self._determinize(workers, stats)
+        with _phase(stats, 'compile'):
+            return CompiledDFA.from_fsm(self)
+
+    def remove_unreachable_states(self, stats=None):
+        with _phase(stats, 'remove_unreachable'):
+            successors = defaultdict(list)
+            for (state, symbol), next_states in self.transitions.items():
+                if symbol == EPSILON or symbol in self.alphabet:
+                    successors[state].extend(next_states)
+
+            reachable = set()
+            queue = deque([self.start_state])
+            while queue:
+                state = queue.popleft()
+                if state in reachable:
+                    continue
+                reachable.add(state)
+                for next_state in successors.get(state, ()):
+                    if next_state not in reachable:
+                        queue.append(next_state)
+
+            new_states = reachable
+            new_final_states = self.final_states & reachable # пересечение финальных состояний с достижимыми состояниями
+            new_transitions = {}
+            for (state, symbol), next_states in self.transitions.items():
+                if state in reachable:
+                    new_next_states = [s for s in next_states if s in reachable]
+                    if new_next_states:
+                        new_transitions[(state, symbol)] = new_next_states
+
+            return FiniteStateMachine(
+                new_states,
+                self.alphabet,
+                new_transitions,
+                self.start_state,
+                new_final_states
+            )
+
+    def minimize(self, method='auto', stats=None):
+        '''method: 'hopcroft', 'valmari', 'brzozowski' или 'auto'. В режиме auto
+        для небольшого НКА сначала пробуется двойное обращение (Бжозовский) —
+        до построения подмножеств самого A; если det(rev(A)) вырастает больше
+        чем в _BRZOZOWSKI_SUBSET_FACTOR раз от числа состояний, попытка
+        прерывается и A детерминизируется и передаётся CompiledDFA.minimize.
+        ДКА с большим алфавитом минимизируются в разреженном виде (SparseDFA).
+        stats — необязательный BuildStats, куда записывается статистика фаз.'''
+        deterministic = self.is_deterministic()
+        if method == 'brzozowski':
+            return _brzozowski(self, stats).to_fsm()
+        if method == 'auto' and deterministic and len(self.alphabet) >= _SPARSE_MIN_SYMBOLS:
+            with _phase(stats, 'compile'):
+                sparse = self.to_sparse()
+            return sparse.minimize(stats).to_fsm()
+        if method == 'auto' and not deterministic and len(self.states) <= _BRZOZOWSKI_MAX_STATES:
+            limit = _BRZOZOWSKI_SUBSET_FACTOR * len(self.states)
+            minimal = _brzozowski(self, stats, limit=limit)
+            if minimal is not None:
+                return minimal.to_fsm()
+        dfa = self.compile(stats=stats)
+        return dfa.minimize(method, stats).to_fsm()
+
+    def to_sparse(self):
+        return SparseDFA.from_fsm(self)
+
+    def reverse(self):
+        '''НКА обращённого языка с целочисленными состояниями; новый старт n
+        ведёт ε-переходами в бывшие допускающие состояния.'''
+        names = [self.start_state] + [s for s in self.states if s != self.start_state]
+        index = {state: i for i, state in enumerate(names)}
+        transitions = defaultdict(list)
+        for (state, symbol), next_states in self.transitions.items():
+            for s in [state] + list(next_states):
+                if s not in index:
+                    index[s] = len(names)
+                    names.append(s)
+            for s in next_states:
+                transitions[(index[s], symbol)].append(index[state])
+        n = len(names)
+        transitions[(n, EPSILON)] = [index[s] for s in self.final_states if s in index]
+        return FiniteStateMachine(range(n + 1), self.alphabet, dict(transitions), n, [0])
+
+    def intersection(self, other, minimize=False):
+        return self.compile().intersection(other.compile(), minimize).to_fsm()
+
+    def union(self, other, minimize=False):
+        return self.compile().union(other.compile(), minimize).to_fsm()
+
+    def difference(self, other, minimize=False):
+        return self.compile().difference(other.compile(), minimize).to_fsm()
+
+    def equivalent(self, other):
+        return self.compile().equivalent(other.compile())
+
+    def lazy_dfa(self, cache_size=4096):
+        '''ДКА, детерминизируемый по мере чтения входа (без полного построения подмножеств).'''
+        return LazyDFA(self, cache_size)
+
+    def __repr__(self):
+        return (f"FSM(States: {self.states}, Alphabet: {self.alphabet}, "
+                f"Start: {self.start_state}, Final: {self.final_states}\n"
+                f"Transitions: {self.transitions})")
+
+
+class BuildStats:
+    '''Статистика построения автомата, собираемая по запросу (параметр stats).
+
+    timings — суммарное время каждой фазы в секундах; peak_subsets — наибольшее
+    число состояний-подмножеств за одну детерминизацию; splits — число
+    расщеплений блоков при минимизации; max_worklist — наибольший размер
+    рабочего списка Хопкрофта; peak_memory — пик памяти в байтах по
+    tracemalloc (только при trace_memory=True, заметно замедляет работу).'''
+
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.timings = {}
+        self.peak_subsets = 0
+        self.splits = 0
+        self.max_worklist = 0
+        self.peak_memory = 0
+
+    @contextmanager
+    def phase(self, name):
+        if self.trace_memory:
+            import tracemalloc  # нужен только для trace_memory и дорог при импорте
+        started = self.trace_memory and not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        begin = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - begin
+            if self.trace_memory:
+                self.peak_memory = max(self.peak_memory, tracemalloc.get_traced_memory()[1])
+            if started:
+                tracemalloc.stop()
+
+    def as_dict(self):
+        return {
+            'timings': dict(self.timings),
+            'peak_subsets': self.peak_subsets,
+            'splits': self.splits,
+            'max_worklist': self.max_worklist,
+            'peak_memory': self.peak_memory,
+        }
+
+    def __repr__(self):
+        phases = ', '.join(f"{name}={seconds:.4f}s" for name, seconds in self.timings.items())
+        return (f"BuildStats({phases}; peak_subsets={self.peak_subsets}, splits={self.splits}, "
+                f"max_worklist={self.max_worklist}, peak_memory={self.peak_memory})")
+
+
+def _phase(stats, name):
+    return stats.phase(name) if stats is not None else nullcontext()
+
+
+_MIN_VECTOR_BATCH = 64  # меньшие группы выгоднее проверять обычным циклом
+_DENSE_TABLE = 0.5          # доля заданных переходов, с которой выгоднее Хопкрофт
+_BRZOZOWSKI_MAX_STATES = 24  # НКА такого размера minimize('auto') пробует обратить дважды
+_BRZOZOWSKI_SUBSET_FACTOR = 4  # предел det(rev(A)) в этой попытке — столько подмножеств на состояние
+_SPARSE_MIN_SYMBOLS = 32     # с такого алфавита minimize('auto') не строит плотную таблицу
+_FINGERPRINT_BALL = 256      # отпечаток IncrementalDFA охватывает до стольких путей из состояния
+_FINGERPRINT_MAX_DEPTH = 16
+
+# Бинарный формат CompiledDFA: заголовок, имена символов (UTF-8, каждое с длиной),
+# выравнивание до 4 байт, таблица переходов int32 little-endian и битовая карта
+# допускающих состояний.
+_MAGIC = b'DFA1'
+_HEADER = struct.Struct('<4sIIiI')   # magic, состояний, символов, старт, байт на символы
+
+
+class CompiledDFA:
+    '''ДКА в табличном виде: состояния и символы пронумерованы подряд,
+    переход из s по символу a хранится в table[s * k + a] (-1 — перехода нет).'''
+
+    def __init__(self, states, symbols, table, start, final):
+        self.states = states          # номер -> исходное имя состояния
+        self.symbols = symbols        # номер -> символ
+        self.table = table            # array('i') размером len(states) * len(symbols)
+        self.start = start
+        self.final = final            # bytearray, 1 у допускающих состояний
+        self.symbol_index = {symbol: i for i, symbol in enumerate(symbols)}
+
+    def __len__(self):
+        return len(self.states)
+
+    @classmethod
+    def from_fsm(cls, fsm):
+        '''Нумерует состояния и символы детерминированного FiniteStateMachine.'''
+        symbols = sorted(fsm.alphabet, key=str)
+        states = [fsm.start_state] + [s for s in fsm.states if s != fsm.start_state]
+        index = {state: i for i, state in enumerate(states)}
+        for (state, symbol), next_states in fsm.transitions.items():
+            for s in [state] + list(next_states):
+                if s not in index:
+                    index[s] = len(states)
+                    states.append(s)
+
+        k = len(symbols)
+        table = array('i', [-1]) * (len(states) * k)
+        for a, symbol in enumerate(symbols):
+            for state, s in index.items():
+                next_states = fsm.transitions.get((state, symbol))
+                if next_states:
+                    table[s * k + a] = index[next_states[0]]
+
+        final = bytearray(len(states))
+        for state in fsm.final_states:
+            if state in index:
+                final[index[state]] = 1
+        return cls(states, symbols, table, 0, final)
+
+    def to_fsm(self):
+        '''Обратное преобразование в словарное представление FiniteStateMachine.'''
+        names, symbols, k = self.states, self.symbols, len(self.symbols)
+        transitions = {}
+        for s, name in enumerate(names):
+            row = s * k
+            for a in range(k):
+                t = self.table[row + a]
+                if t >= 0:
+                    transitions[(name, symbols[a])] = [names[t]]
+        return FiniteStateMachine(
+            names,
+            symbols,
+            transitions,
+            names[self.start],
+            [names[s] for s in range(len(names)) if self.final[s]]
+        )
+
+    def remove_unreachable_states(self):
+        '''Обход в ширину от старта; состояния перенумеровываются в порядке обхода.'''
+        k, table = len(self.symbols), self.table
+        new_index = {self.start: 0}
+        order = [self.start]
+        for s in order:
+            row = s * k
+            for a in range(k):
+                t = table[row + a]
+                if t >= 0 and t not in new_index:
+                    new_index[t] = len(order)
+                    order.append(t)
+
+        new_table = array('i', [-1]) * (len(order) * k)
+        for i, s in enumerate(order):
+            row = s * k
+            for a in range(k):
+                t = table[row + a]
+                if t >= 0:
+                    new_table[i * k + a] = new_index[t]
+        return CompiledDFA(
+            [self.states[s] for s in order],
+            self.symbols,
+            new_table,
+            0,
+            bytearray(self.final[s] for s in order)
+        )
+
+    def minimize(self, method='auto', stats=None):
+        '''Минимизация. method: 'hopcroft', 'valmari', 'brzozowski' или 'auto' —
+        Валмари для разреженных таблиц, иначе Хопкрофт.'''
+        if method == 'auto':
+            defined = sum(1 for t in self.table if t >= 0)
+            sparse = defined < _DENSE_TABLE * len(self.table)
+            method = 'valmari' if sparse else 'hopcroft'
+        if method == 'hopcroft':
+            return self._minimize_hopcroft(stats)
+        if method == 'valmari':
+            return self._minimize_valmari(stats)
+        if method == 'brzozowski':
+            return _brzozowski(self.to_fsm(), stats)
+        raise ValueError(f"Неизвестный метод минимизации: {method}")
+
+    def _minimize_hopcroft(self, stats=None):
+        '''Минимизация алгоритмом Хопкрофта за O(n·k·log n).
+
+        Автомат дополняется явным стоком с номером n; класс стока в результат
+        не попадает, поэтому тупиковые состояния удаляются.'''
+        with _phase(stats, 'remove_unreachable'):
+            dfa = self.remove_unreachable_states()
+        n, k = len(dfa), len(dfa.symbols)
+        with _phase(stats, 'inverse_index'):
+            targets, inv_start, inv = dfa._inverse_index()
+        partition = _Partition(n + 1)
+        for s in range(n):
+            if dfa.final[s]:
+                partition.mark(s)
+
+        worklist = [partition.smaller(old, new) for old, new in partition.split()]
+
+        def predecessors(a, states):
+            offset = a * (n + 2)
+            base = a * (n + 1)
+            result = []
+            for t in states:
+                result.extend(inv[base + inv_start[offset + t]:base + inv_start[offset + t + 1]])
+            return result
+
+        with _phase(stats, 'refine'):
+            partition.refine(worklist, k, predecessors, stats)
+        if stats is not None:
+            stats.splits += len(partition.first) - 1
+
+        block_of = partition.block_of
+        dead = block_of[n]
+        if block_of[dfa.start] == dead:
+            return CompiledDFA([0], dfa.symbols, array('i', [-1]) * k, 0, bytearray(1))
+        with _phase(stats, 'quotient'):
+            return dfa._quotient([b if b != dead else -1 for b in block_of[:n]],
+                                 len(partition.first))
+
+    def _minimize_valmari(self, stats=None):
+        '''Минимизация частичного ДКА по Валмари–Лехтинену за O(m·log n),
+        где m — число имеющихся переходов: неявный сток не достраивается.
+
+        Состояния, из которых допускание недостижимо, отбрасываются заранее.'''
+        with _phase(stats, 'remove_unreachable'):
+            dfa = self.remove_unreachable_states()
+        n, k, table = len(dfa), len(dfa.symbols), dfa.table
+
+        # оставляем только состояния, из которых достижимо допускание
+        incoming = [[] for _ in range(n)]
+        for s in range(n):
+            for t in table[s * k:s * k + k]:
+                if t >= 0:
+                    incoming[t].append(s)
+        live = bytearray(dfa.final)
+        stack = [s for s in range(n) if live[s]]
+        while stack:
+            for s in incoming[stack.pop()]:
+                if not live[s]:
+                    live[s] = 1
+                    stack.append(s)
+        if not live[dfa.start]:
+            return CompiledDFA([0], dfa.symbols, array('i', [-1]) * k, 0, bytearray(1))
+
+        tails, labels, heads = [], [], []
+        for s in range(n):
+            if not live[s]:
+                continue
+            row = s * k
+            for a in range(k):
+                t = table[row + a]
+                if t >= 0 and live[t]:
+                    tails.append(s)
+                    labels.append(a)
+                    heads.append(t)
+        with _phase(stats, 'refine'):
+            blocks = _valmari(n, dfa.final, tails, labels, heads)
+        if stats is not None:
+            stats.splits += len(blocks.first) - 1
+        block_of = [blocks.block_of[s] if live[s] else -1 for s in range(n)]
+        with _phase(stats, 'quotient'):
+            return dfa._quotient(block_of, len(blocks.first))
+
+    def _inverse_index(self):
+        '''Обратные переходы для автомата, дополненного стоком n.
+
+        Возвращает (targets, inv_start, inv): targets — полная таблица переходов,
+        прообразы t по символу a лежат в inv[a*(n+1) + i] для
+        inv_start[a*(n+2) + t] <= i < inv_start[a*(n+2) + t + 1].'''
+        n, k = len(self), len(self.symbols)
+        targets = array('i', (t if t >= 0 else n for t in self.table))
+        targets.extend([n] * k)
+        inv_start, inv = _csr_inverse(targets, n + 1, k)
+        return targets, inv_start, inv
+
+    def _quotient(self, block_of, count):
+        '''Склеивает состояния по классам; классы получают имена 0..count-1.'''
+        k, table = len(self.symbols), self.table
+        new_table = array('i', [-1]) * (count * k)
+        final = bytearray(count)
+        for s, b in enumerate(block_of):
+            if b < 0:
+                continue
+            row = s * k
+            for a in range(k):
+                t = table[row + a]
+                if t >= 0 and block_of[t] >= 0:
+                    new_table[b * k + a] = block_of[t]
+            if self.final[s]:
+                final[b] = 1
+        quotient = CompiledDFA(list(range(count)), self.symbols, new_table,
+                               block_of[self.start], final)
+        quotient = quotient.remove_unreachable_states()
+        quotient.states = list(range(len(quotient)))
+        return quotient
+
+    def intersection(self, other, minimize=False):
+        return self._product(other, 'and', minimize)
+
+    def union(self, other, minimize=False):
+        return self._product(other, 'or', minimize)
+
+    def difference(self, other, minimize=False):
+        return self._product(other, 'diff', minimize)
+
+    def _product(self, other, mode, minimize):
+        '''Произведение автоматов: обходом в ширину строятся только достижимые пары.
+
+        Отсутствующий переход в одном из автоматов даёт в паре номер -1
+        (неявный сток), такие пары сохраняются только там, где они ещё могут
+        привести к допусканию в режиме mode ('and', 'or', 'diff').'''
+        symbols = sorted(set(self.symbols) | set(other.symbols), key=str)
+        cols1 = [self.symbol_index.get(symbol, -1) for symbol in symbols]
+        cols2 = [other.symbol_index.get(symbol, -1) for symbol in symbols]
+        k1, k2, m = len(self.symbols), len(other.symbols), len(other) + 1
+        table1, table2 = self.table, other.table
+
+        start = (self.start, other.start)
+        index = {(self.start + 1) * m + other.start + 1: 0}
+        pairs = [start]
+        table = array('i')
+        for p, q in pairs:
+            for a1, a2 in zip(cols1, cols2):
+                p2 = table1[p * k1 + a1] if p >= 0 and a1 >= 0 else -1
+                q2 = table2[q * k2 + a2] if q >= 0 and a2 >= 0 else -1
+                if p2 < 0 and (q2 < 0 or mode != 'or') or q2 < 0 and mode == 'and':
+                    table.append(-1)
+                    continue
+                key = (p2 + 1) * m + q2 + 1
+                target = index.get(key)
+                if target is None:
+                    target = index[key] = len(pairs)
+                    pairs.append((p2, q2))
+                table.append(target)
+
+        final = bytearray(len(pairs))
+        for i, (p, q) in enumerate(pairs):
+            f1 = p >= 0 and self.final[p] == 1
+            f2 = q >= 0 and other.final[q] == 1
+            if mode == 'and':
+                final[i] = f1 and f2
+            elif mode == 'or':
+                final[i] = f1 or f2
+            else:
+                final[i] = f1 and not f2
+        states = [(self.states[p] if p >= 0 else None, other.states[q] if q >= 0 else None)
+                  for p, q in pairs]
+        product = CompiledDFA(states, symbols, table, 0, final)
+        return product.minimize() if minimize else product
+
+    def equivalent(self, other):
+        '''Проверка эквивалентности алгоритмом Хопкрофта–Карпа (union-find).
+
+        Возвращает (True, None) или (False, цепочка), которую допускает ровно
+        один из автоматов. Минимизация не требуется.'''
+        symbols = sorted(set(self.symbols) | set(other.symbols), key=str)
+        cols1 = [self.symbol_index.get(symbol, -1) for symbol in symbols]
+        cols2 = [other.symbol_index.get(symbol, -1) for symbol in symbols]
+        n1, n2 = len(self), len(other)
+        k1, k2 = len(self.symbols), len(other.symbols)
+        # узлы union-find: 0..n1 — первый автомат (n1 — сток), дальше второй
+        parent = list(range(n1 + n2 + 2))
+
+        def find(x):
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        def is_final(p, q):
+            return (p < n1 and self.final[p] == 1), (q < n2 and other.final[q] == 1)
+
+        pairs = [(self.start, other.start)]
+        came_from = [(-1, None)]
+        f1, f2 = is_final(self.start, other.start)
+        if f1 != f2:
+            return False, ''
+        parent[find(n1 + 1 + other.start)] = find(self.start)
+
+        for i, (p, q) in enumerate(pairs):
+            for symbol, a1, a2 in zip(symbols, cols1, cols2):
+                p2 = self.table[p * k1 + a1] if p < n1 and a1 >= 0 else -1
+                q2 = other.table[q * k2 + a2] if q < n2 and a2 >= 0 else -1
+                p2 = p2 if p2 >= 0 else n1
+                q2 = q2 if q2 >= 0 else n2
+                r1, r2 = find(p2), find(n1 + 1 + q2)
+                if r1 == r2:
+                    continue
+                parent[r2] = r1
+                pairs.append((p2, q2))
+                came_from.append((i, symbol))
+                f1, f2 = is_final(p2, q2)
+                if f1 != f2:
+                    word = []
+                    j = len(pairs) - 1
+                    while j > 0:
+                        j, symbol = came_from[j]
+                        word.append(str(symbol))
+                    return False, ''.join(reversed(word))
+        return True, None
+
+    def to_sparse(self):
+        k, table = len(self.symbols), self.table
+        rows = []
+        for s in range(len(self)):
+            row = s * k
+            rows.append([(a, table[row + a]) for a in range(k) if table[row + a] >= 0])
+        return SparseDFA.from_rows(self.states, self.symbols, rows, self.start, self.final)
+
+    def incremental(self):
+        '''Минимизатор, который после правок переходов уточняет только затронутые блоки.'''
+        return IncrementalDFA(self)
+
+    def accepts(self, string):
+        '''Проверяет, допускает ли автомат цепочку (символы — элементы string).'''
+        k, table, index = len(self.symbols), self.table, self.symbol_index
+        s = self.start
+        for symbol in string:
+            a = index.get(symbol)
+            if a is None:
+                return False
+            s = table[s * k + a]
+            if s < 0:
+                return False
+        return self.final[s] == 1
+
+    def match_stream(self, strings):
+        '''Лениво выдаёт результат проверки для каждой цепочки из итерируемого источника.'''
+        k, table, final, start = len(self.symbols), self.table, self.final, self.start
+        get = self.symbol_index.get
+        for string in strings:
+            s = start
+            for symbol in string:
+                a = get(symbol)
+                if a is None:
+                    s = -1
+                    break
+                s = table[s * k + a]
+                if s < 0:
+                    break
+            yield s >= 0 and final[s] == 1
+
+    def accepts_many(self, strings, vectorize=True):
+        '''Проверяет набор цепочек, возвращает список bool.
+
+        При наличии NumPy строки группируются по длине, и каждая группа
+        прогоняется по таблице одновременно — один шаг на позицию символа.'''
+        strings = list(strings)
+        np = _import_numpy() if vectorize else None
+        if np is None:
+            return list(self.match_stream(strings))
+
+        # векторно — только строки str; кортежи и списки символов идут обычным циклом
+        groups = defaultdict(list)
+        scalar = []
+        for i, string in enumerate(strings):
+            if isinstance(string, str):
+                groups[len(string)].append(i)
+            else:
+                scalar.append(i)
+
+        result = [False] * len(strings)
+        full, lut, final = self._numpy_tables(np)
+        for length, indices in groups.items():
+            if len(indices) < _MIN_VECTOR_BATCH:
+                scalar.extend(indices)
+                continue
+            states = np.full(len(indices), self.start, dtype=np.int32)
+            if length:
+                batch = np.array([strings[i] for i in indices], dtype=f'<U{length}')
+                codes = batch.view(np.uint32).reshape(len(indices), length)
+                ids = lut[np.minimum(codes, len(lut) - 1)]
+                for j in range(length):
+                    states = full[states, ids[:, j]]
+            for i, accepted in zip(indices, final[states].tolist()):
+                result[i] = accepted
+        for i, accepted in zip(scalar, self.match_stream(strings[i] for i in scalar)):
+            result[i] = accepted
+        return result
+
+    def _numpy_tables(self, np):
+        '''Таблица n+1 x k+1 со стоком n и столбцом k для символов вне алфавита,
+        перекодировка кодов Unicode в номера символов и флаги допускания.'''
+        n, k = len(self), len(self.symbols)
+        full = np.full((n + 1, k + 1), n, dtype=np.int32)
+        table = np.frombuffer(self.table, dtype=np.int32).reshape(n, k)
+        full[:n, :k] = np.where(table >= 0, table, n)
+        codes = {ord(symbol): a for a, symbol in enumerate(self.symbols)
+                 if isinstance(symbol, str) and len(symbol) == 1}
+        lut = np.full(max(codes, default=0) + 2, k, dtype=np.int32)
+        for code, a in codes.items():
+            lut[code] = a
+        final = np.zeros(n + 1, dtype=bool)
+        final[:n] = np.frombuffer(bytes(self.final), dtype=np.uint8) == 1
+        return full, lut, final
+
+    def save(self, path):
+        '''Сохраняет автомат в бинарном формате (имена состояний не сохраняются).'''
+        names = []
+        for symbol in self.symbols:
+            if not isinstance(symbol, str):
+                raise ValueError(f"Сохраняются только строковые символы: {symbol!r}")
+            data = symbol.encode('utf-8')
+            names.append(struct.pack('<I', len(data)) + data)
+        names = b''.join(names)
+        n = len(self)
+        table = array('i', self.table)
+        if sys.byteorder == 'big':
+            table.byteswap()
+        bitmap = bytearray((n + 7) // 8)
+        for s in range(n):
+            if self.final[s]:
+                bitmap[s >> 3] |= 1 << (s & 7)
+
+        with open(path, 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC, n, len(self.symbols), self.start, len(names)))
+            f.write(names)
+            f.write(b'\0' * (-(_HEADER.size + len(names)) % 4))
+            f.write(table.tobytes())
+            f.write(bitmap)
+
+    @classmethod
+    def load(cls, path, use_mmap=True):
+        '''Загружает автомат, сохранённый save().
+
+        При use_mmap таблица переходов — это memoryview поверх отображённого в
+        память файла, без копирования; состояния получают имена 0..n-1.'''
+        with open(path, 'rb') as f:
+            if use_mmap:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                data = f.read()
+        if len(data) < _HEADER.size:
+            raise ValueError(f"Файл {path} не является сохранённым автоматом")
+        magic, n, k, start, names_size = _HEADER.unpack_from(data, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"Файл {path} не является сохранённым автоматом")
+
+        if not 0 <= start < n:
+            raise ValueError(f"Файл {path} повреждён: стартовое состояние {start} вне 0..{n - 1}")
+        names_end = _HEADER.size + names_size
+        if names_end > len(data):
+            raise ValueError(f"Файл {path} повреждён: имена символов обрезаны")
+
+        offset = _HEADER.size
+        symbols = []
+        for _ in range(k):
+            if offset + 4 > names_end:
+                raise ValueError(f"Файл {path} повреждён: имена символов обрезаны")
+            (length,) = struct.unpack_from('<I', data, offset)
+            if offset + 4 + length > names_end:
+                raise ValueError(f"Файл {path} повреждён: имена символов обрезаны")
+            symbols.append(bytes(data[offset + 4:offset + 4 + length]).decode('utf-8'))
+            offset += 4 + length
+        offset = names_end
+        offset += -offset % 4
+
+        table_end = offset + 4 * n * k
+        if len(data) < table_end + (n + 7) // 8:
+            raise ValueError(f"Файл {path} повреждён: таблица переходов обрезана")
+        if use_mmap and sys.byteorder == 'little':
+            table = memoryview(data)[offset:table_end].cast('i')
+        else:
+            table = array('i')
+            table.frombytes(bytes(data[offset:table_end]))
+            if sys.byteorder == 'big':
+                table.byteswap()
+        bitmap = data[table_end:table_end + (n + 7) // 8]
+        final = bytearray((bitmap[s >> 3] >> (s & 7)) & 1 for s in range(n))
+
+        dfa = cls(range(n), symbols, table, start, final)
+        dfa._buffer = data    # отображение должно жить столько же, сколько автомат
+        return dfa
+
+    def __repr__(self):
+        return (f"CompiledDFA(states={len(self.states)}, symbols={self.symbols}, "
+                f"start={self.start}, final={sum(self.final)})")
+
+
+
+
+class SparseDFA:
+    '''ДКА в CSR-виде для больших алфавитов: переходы состояния s занимают
+    позиции row_start[s]..row_start[s+1]-1 в labels (номера символов по
+    возрастанию) и targets. Память и время обходов пропорциональны числу
+    имеющихся переходов, а не состояниям × алфавит.'''
+
+    def __init__(self, states, symbols, row_start, labels, targets, start, final):
+        self.states = states
+        self.symbols = symbols
+        self.row_start = row_start
+        self.labels = labels
+        self.targets = targets
+        self.start = start
+        self.final = final
+        self.symbol_index = {symbol: i for i, symbol in enumerate(symbols)}
+
+    def __len__(self):
+        return len(self.states)
+
+    @classmethod
+    def from_rows(cls, states, symbols, rows, start, final):
+        '''rows[s] — список пар (номер символа, цель), упорядоченный по символу.'''
+        row_start = array('i', [0])
+        labels, targets = array('i'), array('i')
+        for row in rows:
+            for a, t in row:
+                labels.append(a)
+                targets.append(t)
+            row_start.append(len(labels))
+        return cls(states, symbols, row_start, labels, targets, start, bytearray(final))
+
+    @classmethod
+    def from_fsm(cls, fsm):
+        '''Строит CSR прямо из словаря переходов, минуя плотную таблицу.'''
+        if not fsm.is_deterministic():
+            return fsm.compile().to_sparse()
+        symbols = sorted(fsm.alphabet, key=str)
+        symbol_index = {symbol: a for a, symbol in enumerate(symbols)}
+        states = [fsm.start_state] + [s for s in fsm.states if s != fsm.start_state]
+        index = {state: i for i, state in enumerate(states)}
+        rows = defaultdict(list)
+        for (state, symbol), next_states in fsm.transitions.items():
+            a = symbol_index.get(symbol)
+            if a is None or not next_states:
+                continue
+            for s in (state, next_states[0]):
+                if s not in index:
+                    index[s] = len(states)
+                    states.append(s)
+            rows[index[state]].append((a, index[next_states[0]]))
+        final = bytearray(len(states))
+        for state in fsm.final_states:
+            if state in index:
+                final[index[state]] = 1
+        return cls.from_rows(states, symbols, [sorted(rows.get(s, ())) for s in range(len(states))],
+                             0, final)
+
+    def row(self, s):
+        lo, hi = self.row_start[s], self.row_start[s + 1]
+        return zip(self.labels[lo:hi], self.targets[lo:hi])
+
+    def step(self, s, a):
+        lo, hi = self.row_start[s], self.row_start[s + 1]
+        i = bisect_left(self.labels, a, lo, hi)
+        if i < hi and self.labels[i] == a:
+            return self.targets[i]
+        return -1
+
+    def accepts(self, string):
+        s = self.start
+        for symbol in string:
+            a = self.symbol_index.get(symbol)
+            if a is None:
+                return False
+            s = self.step(s, a)
+            if s < 0:
+                return False
+        return self.final[s] == 1
+
+    def to_compiled(self):
+        k = len(self.symbols)
+        table = array('i', [-1]) * (len(self) * k)
+        for s in range(len(self)):
+            for a, t in self.row(s):
+                table[s * k + a] = t
+        return CompiledDFA(self.states, self.symbols, table, self.start, bytearray(self.final))
+
+    def to_fsm(self):
+        names, symbols = self.states, self.symbols
+        transitions = {}
+        for s, name in enumerate(names):
+            for a, t in self.row(s):
+                transitions[(name, symbols[a])] = [names[t]]
+        return FiniteStateMachine(
+            names,
+            symbols,
+            transitions,
+            names[self.start],
+            [names[s] for s in range(len(names)) if self.final[s]]
+        )
+
+    def remove_unreachable_states(self):
+        new_index = {self.start: 0}
+        order = [self.start]
+        for s in order:
+            for a, t in self.row(s):
+                if t not in new_index:
+                    new_index[t] = len(order)
+                    order.append(t)
+        rows = [[(a, new_index[t]) for a, t in self.row(s)] for s in order]
+        return SparseDFA.from_rows([self.states[s] for s in order], self.symbols, rows, 0,
+                                   [self.final[s] for s in order])
+
+    def symbol_classes(self):
+        '''Сжатие алфавита: символы с одинаковыми столбцами переходов получают
+        один номер класса. Возвращает (класс каждого символа, число классов).'''
+        columns = defaultdict(list)
+        for s in range(len(self)):
+            for a, t in self.row(s):
+                columns[a].append(s)
+                columns[a].append(t)
+        classes = {}
+        class_of = [classes.setdefault(tuple(columns.get(a, ())), len(classes))
+                    for a in range(len(self.symbols))]
+        return class_of, len(classes)
+
+    def minimize(self, stats=None):
+        '''Минимизация по Валмари на CSR; символы с одинаковыми столбцами
+        уточняются один раз, как один класс.'''
+        with _phase(stats, 'remove_unreachable'):
+            dfa = self.remove_unreachable_states()
+        n = len(dfa)
+        with _phase(stats, 'symbol_classes'):
+            class_of, _ = dfa.symbol_classes()
+        representative = {}
+        for a, c in enumerate(class_of):
+            representative.setdefault(c, a)
+
+        incoming = [[] for _ in range(n)]
+        for s in range(n):
+            for a, t in dfa.row(s):
+                incoming[t].append(s)
+        live = bytearray(dfa.final)
+        stack = [s for s in range(n) if live[s]]
+        while stack:
+            for s in incoming[stack.pop()]:
+                if not live[s]:
+                    live[s] = 1
+                    stack.append(s)
+        if not live[dfa.start]:
+            return SparseDFA.from_rows([0], dfa.symbols, [[]], 0, [0])
+
+        tails, labels, heads = [], [], []
+        for s in range(n):
+            if not live[s]:
+                continue
+            for a, t in dfa.row(s):
+                c = class_of[a]
+                if live[t] and representative[c] == a:
+                    tails.append(s)
+                    labels.append(c)
+                    heads.append(t)
+        with _phase(stats, 'refine'):
+            blocks = _valmari(n, dfa.final, tails, labels, heads)
+        if stats is not None:
+            stats.splits += len(blocks.first) - 1
+
+        block_of, elems, first = blocks.block_of, blocks.elems, blocks.first
+        rows, final = [], []
+        for b in range(len(first)):
+            s = elems[first[b]]
+            rows.append([(a, block_of[t]) for a, t in dfa.row(s) if live[t]] if live[s] else [])
+            final.append(dfa.final[s])
+        quotient = SparseDFA.from_rows(list(range(len(first))), dfa.symbols, rows,
+                                       block_of[dfa.start], final)
+        quotient = quotient.remove_unreachable_states()
+        quotient.states = list(range(len(quotient)))
+        return quotient
+
+    def __repr__(self):
+        return (f"SparseDFA(states={len(self.states)}, symbols={len(self.symbols)}, "
+                f"transitions={len(self.labels)}, start={self.start}, final={sum(self.final)})")
+
+
+class IncrementalDFA:
+    '''Минимальный ДКА, поддерживаемый при небольших правках.
+
+    Хранит полную таблицу переходов со стоком, обратный индекс в массивах CSR
+    (с небольшим словарём правок поверх) и разбиение на классы
+    эквивалентности. Изменённые состояния, которые больше не совпадают со
+    своим блоком, выделяются в отдельные блоки, и уточнение идёт только от
+    них. Затем блоки, ставшие эквивалентными, сливаются: кандидатов ищут по
+    отпечаткам языка (допускание на глубину нескольких символов),
+    эквивалентность проверяется алгоритмом Хопкрофта–Карпа, а после слияния
+    проверяются прообразы меньшего из блоков. Разбиение остаётся самым
+    грубым, и minimize() лишь выписывает классы. Если отпечатки плохо
+    различают блоки и проверки обходятся дороже полной минимизации,
+    разбиение строится заново.'''
+
+    def __init__(self, dfa):
+        self.rebuild(dfa)
+
+    def rebuild(self, dfa=None):
+        '''Полная минимизация с нуля (по умолчанию — текущего автомата).'''
+        if dfa is None:
+            dfa = self.to_compiled()
+        n, k = len(dfa), len(dfa.symbols)
+        self.symbols = list(dfa.symbols)
+        self.symbol_index = {symbol: a for a, symbol in enumerate(self.symbols)}
+        self.names = list(dfa.states) + [None]
+        self.index = {name: s for s, name in enumerate(dfa.states)}
+        self.sink = n
+        self.start = dfa.start
+        self.final = bytearray(dfa.final) + bytearray(1)
+        self.targets, self._inv_start, self._inv = dfa._inverse_index()
+        self._reset_overlay()
+        self._dirty = set()
+
+        # отпечатки: levels[i][s] — хеш допускания s на глубину i символов
+        depth = 1
+        while depth < _FINGERPRINT_MAX_DEPTH and k ** (depth + 1) <= _FINGERPRINT_BALL:
+            depth += 1
+        columns = [self.targets[a::k] for a in range(k)]
+        level = list(self.final)
+        self.levels = [level]
+        for _ in range(depth):
+            level = list(map(hash, zip(self.final,
+                                       *(map(level.__getitem__, column) for column in columns))))
+            self.levels.append(level)
+        self._repartition()
+
+    def _repartition(self, stats=None):
+        '''Строит разбиение Хопкрофтом с нуля по текущей таблице.'''
+        partition = self.partition = _Partition(len(self.names))
+        for s, final in enumerate(self.final):
+            if final:
+                partition.mark(s)
+        worklist = [partition.smaller(old, new) for old, new in partition.split()]
+        splits = partition.refine(worklist, len(self.symbols), self._predecessors, stats)
+        if stats is not None:
+            stats.splits += splits
+        # блоки по отпечаткам: в устойчивом разбиении отпечаток у всего блока один
+        top = self.levels[-1]
+        self.block_print = [top[partition.elems[first]] for first in partition.first]
+        self.similar = defaultdict(set)
+        for b, fingerprint in enumerate(self.block_print):
+            self.similar[fingerprint].add(b)
+
+    def _reset_overlay(self):
+        # переходы, изменённые после построения CSR: added[(a, t)] — новые
+        # прообразы t, в срезах CSR для пар из stale есть устаревшие
+        self._base = array('i', self.targets)
+        self._csr_size = len(self.names)
+        self._added = {}
+        self._stale = set()
+        self._edits = 0
+
+    def _reindex(self):
+        '''Перестраивает CSR по текущей таблице, когда правок накопилось много.'''
+        self._inv_start, self._inv = _csr_inverse(self.targets, len(self.names), len(self.symbols))
+        self._reset_overlay()
+
+    def _predecessors(self, a, states):
+        k, targets = len(self.symbols), self.targets
+        inv_start, inv, size = self._inv_start, self._inv, self._csr_size
+        offset, base = a * (size + 1), a * size
+        added, stale = self._added, self._stale
+        result = []
+        for t in states:
+            if t < size:
+                i, j = base + inv_start[offset + t], base + inv_start[offset + t + 1]
+                if stale and (a, t) in stale:
+                    result.extend(s for s in inv[i:j] if targets[s * k + a] == t)
+                else:
+                    result.extend(inv[i:j])
+            if added:
+                extra = added.get((a, t))
+                if extra:
+                    result.extend(extra)
+        return result
+
+    def _state(self, name):
+        s = self.index.get(name)
+        if s is not None:
+            return s
+        s = self.partition.add()
+        self.index[name] = s
+        self.names.append(name)
+        self.final.append(0)
+        self.targets.extend([self.sink] * len(self.symbols))
+        for a in range(len(self.symbols)):
+            self._added.setdefault((a, self.sink), set()).add(s)
+        self._edits += len(self.symbols)
+        # язык нового состояния пуст, как у стока
+        for level in self.levels:
+            level.append(level[self.sink])
+        self._index_block(self.partition.block_of[s])
+        self._dirty.add(s)
+        return s
+
+    def _symbol(self, symbol):
+        a = self.symbol_index.get(symbol)
+        if a is None:
+            raise ValueError(f"Символ {symbol!r} не входит в алфавит автомата")
+        return a
+
+    def _set_target(self, s, a, t):
+        pos = s * len(self.symbols) + a
+        old = self.targets[pos]
+        if old == t:
+            return
+        base = self._base[pos] if pos < len(self._base) else -1
+        if old == base:
+            self._stale.add((a, old))
+        else:
+            self._added[(a, old)].discard(s)
+        if t != base:
+            self._added.setdefault((a, t), set()).add(s)
+        self.targets[pos] = t
+        self._edits += 1
+        self._dirty.add(s)
+
+    def add_transition(self, state, symbol, target):
+        a = self._symbol(symbol)
+        self._set_target(self._state(state), a, self._state(target))
+
+    def remove_transition(self, state, symbol):
+        a = self._symbol(symbol)
+        s = self.index.get(state)
+        if s is not None:
+            self._set_target(s, a, self.sink)
+
+    def set_final(self, state, final=True):
+        s = self._state(state)
+        if self.final[s] != final:
+            self.final[s] = 1 if final else 0
+            self._dirty.add(s)
+
+    def refine(self, stats=None):
+        '''Выделяет в отдельные блоки изменённые состояния, которые больше не
+        совпадают с блоком, уточняет разбиение и сливает блоки, ставшие
+        эквивалентными. Возвращает число расщеплений.'''
+        if self._edits > self._csr_size:
+            self._reindex()
+        partition = self.partition
+        dirty, self._dirty = self._dirty, set()
+        count, free = len(partition.first), set(partition.free)
+        worklist = []
+        for s in dirty:
+            if not self._fits(s, dirty):
+                partition.mark(s)
+                for old, new in partition.split():
+                    worklist.append(partition.smaller(old, new))
+        with _phase(stats, 'refine'):
+            splits = partition.refine(worklist, len(self.symbols), self._predecessors, stats)
+        if stats is not None:
+            stats.splits += splits
+        with _phase(stats, 'merge'):
+            changed = self._update_fingerprints(dirty)
+            created = free.difference(partition.free)
+            created.update(range(count, len(partition.first)))
+            for b in created | {partition.block_of[s] for s in changed}:
+                self._index_block(b)
+            merged = self._merge(dirty)
+        if not merged:
+            with _phase(stats, 'refine'):
+                self._repartition(stats)
+        return splits
+
+    def _fits(self, s, dirty):
+        '''Совпадает ли изменённое состояние s по допусканию и блокам целей
+        с неизменённым состоянием своего блока.'''
+        partition, k, targets = self.partition, len(self.symbols), self.targets
+        block_of, elems = partition.block_of, partition.elems
+        b = block_of[s]
+        i, past = partition.first[b], partition.past[b]
+        while i < past and elems[i] in dirty:
+            i += 1
+        if i == past:
+            return partition.size(b) == 1
+        e = elems[i]
+        if self.final[s] != self.final[e]:
+            return False
+        return all(block_of[t] == block_of[u] for t, u in
+                   zip(targets[s * k:s * k + k], targets[e * k:e * k + k]))
+
+    def _index_block(self, b):
+        fingerprint = self.levels[-1][self.partition.elems[self.partition.first[b]]]
+        if b < len(self.block_print):
+            if self.block_print[b] == fingerprint:
+                return
+            self._unindex_block(b)
+        else:
+            self.block_print.extend([None] * (b + 1 - len(self.block_print)))
+        self.block_print[b] = fingerprint
+        self.similar[fingerprint].add(b)
+
+    def _unindex_block(self, b):
+        fingerprint = self.block_print[b]
+        bucket = self.similar.get(fingerprint)
+        if bucket is not None:
+            bucket.discard(b)
+            if not bucket:
+                del self.similar[fingerprint]
+        self.block_print[b] = None
+
+    def _update_fingerprints(self, dirty):
+        '''Пересчитывает отпечатки в окрестности изменённых состояний: на
+        глубине i меняются только прообразы изменившихся на глубине i - 1.
+        Возвращает состояния, чей итоговый отпечаток изменился.'''
+        k, targets, final, levels = len(self.symbols), self.targets, self.final, self.levels
+        changed = [s for s in dirty if levels[0][s] != final[s]]
+        for s in changed:
+            levels[0][s] = final[s]
+        for i in range(1, len(levels)):
+            level, below = levels[i], levels[i - 1]
+            candidates = set(dirty)
+            for a in range(k):
+                candidates.update(self._predecessors(a, changed))
+            changed = []
+            for s in candidates:
+                row = s * k
+                fingerprint = hash((final[s], *map(below.__getitem__, targets[row:row + k])))
+                if fingerprint != level[s]:
+                    level[s] = fingerprint
+                    changed.append(s)
+        return changed
+
+    def _merge(self, candidates):
+        '''Сливает блоки кандидатов с эквивалентными блоками; после каждого
+        слияния кандидатами становятся прообразы меньшего блока.
+
+        Если отпечатки плохо различают блоки, проверки Хопкрофта–Карпа могут
+        обойти больше пар, чем стоит полная минимизация; тогда слияние
+        прерывается и возвращается False.'''
+        k, partition = len(self.symbols), self.partition
+        block_of, first, past = partition.block_of, partition.first, partition.past
+        top = self.levels[-1]
+        budget = len(self.names) * k
+        pending = list(candidates)
+        checked = set()
+        while pending:
+            s = pending.pop()
+            if s in checked:
+                continue
+            checked.add(s)
+            for other in list(self.similar.get(top[s], ())):
+                # блок мог опустеть, слившись с другим на предыдущем шаге
+                if other == block_of[s] or not partition.size(other):
+                    continue
+                pairs, steps = self._equivalent(s, partition.elems[first[other]])
+                budget -= steps
+                if budget < 0:
+                    return False
+                if pairs is None:
+                    continue
+                for x, y in pairs:
+                    b, c = block_of[x], block_of[y]
+                    if b == c:
+                        continue
+                    smaller = c if partition.size(c) <= partition.size(b) else b
+                    moved = partition.elems[first[smaller]:past[smaller]]
+                    self._unindex_block(smaller)
+                    partition.merge(b, c)
+                    for a in range(k):
+                        pending.extend(self._predecessors(a, moved))
+        return True
+
+    def _equivalent(self, x, y):
+        '''Проверка Хопкрофта–Карпа для блоков состояний x и y. Возвращает
+        (пары состояний, чьи блоки надо слить, или None, если блоки
+        различимы; число рассмотренных пар).'''
+        k, targets, final = len(self.symbols), self.targets, self.final
+        block_of, top = self.partition.block_of, self.levels[-1]
+        parent = {}
+        pairs = []
+        pending = [(x, y)]
+        steps = 0
+        while pending:
+            steps += 1
+            s, t = pending.pop()
+            b, c = _find(parent, block_of[s]), _find(parent, block_of[t])
+            if b == c:
+                continue
+            if final[s] != final[t] or top[s] != top[t]:
+                return None, steps
+            parent[c] = b
+            pairs.append((s, t))
+            pending.extend(zip(targets[s * k:s * k + k], targets[t * k:t * k + k]))
+        return pairs, steps
+
+    def minimize(self, stats=None):
+        '''Текущий минимальный автомат: классы разбиения, достижимые из
+        начального, без класса стока (в нём все тупиковые состояния).'''
+        self.refine(stats)
+        k, targets = len(self.symbols), self.targets
+        partition = self.partition
+        block_of, elems, first = partition.block_of, partition.elems, partition.first
+        dead = block_of[self.sink]
+        start = block_of[self.start]
+        if start == dead:
+            return CompiledDFA([0], self.symbols, array('i', [-1]) * k, 0, bytearray(1))
+
+        with _phase(stats, 'quotient'):
+            # номера классов в порядке обхода; у класса стока номер остаётся -1
+            number = [-1] * len(first)
+            number[start] = 0
+            order = [start]
+            cells = []
+            for b in order:
+                row = elems[first[b]] * k
+                for c in map(block_of.__getitem__, targets[row:row + k]):
+                    cells.append(c)
+                    if number[c] < 0 and c != dead:
+                        number[c] = len(order)
+                        order.append(c)
+            table = array('i', map(number.__getitem__, cells))
+            final = bytearray(self.final[elems[first[b]]] for b in order)
+            return CompiledDFA(list(range(len(order))), self.symbols, table, 0, final)
+
+    def to_compiled(self):
+        '''Текущий (неминимизированный) автомат без стока.'''
+        k, sink = len(self.symbols), self.sink
+        n = len(self.names)
+        keep = [s for s in range(n) if s != sink]
+        renumber = {s: i for i, s in enumerate(keep)}
+        table = array('i', [-1]) * (len(keep) * k)
+        for i, s in enumerate(keep):
+            row = s * k
+            for a in range(k):
+                t = self.targets[row + a]
+                if t != sink:
+                    table[i * k + a] = renumber[t]
+        return CompiledDFA([self.names[s] for s in keep], self.symbols, table,
+                           renumber[self.start], bytearray(self.final[s] for s in keep))
+
+
+class LazyDFA:
+    '''Ленивое построение подмножеств: состояние-подмножество (битовая маска)
+    и переходы из него вычисляются только когда вход до них доходит. Строки
+    переходов хранятся в LRU-кэше не более чем для cache_size подмножеств.'''
+
+    def __init__(self, fsm, cache_size=4096):
+        self.fsm = fsm
+        self.cache_size = cache_size
+        self.symbols = sorted(fsm.alphabet, key=str)
+        self.symbol_index = {symbol: a for a, symbol in enumerate(self.symbols)}
+        self.names, self.start, self._succ, self.final_mask = fsm._bitsets(self.symbols)
+        self._cache = OrderedDict()   # маска -> {номер символа: следующая маска}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def step(self, mask, symbol):
+        a = self.symbol_index.get(symbol)
+        if a is None:
+            return 0
+        row = self._cache.get(mask)
+        if row is None:
+            row = self._cache[mask] = {}
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+                self.evictions += 1
+        else:
+            self._cache.move_to_end(mask)
+            next_mask = row.get(a)
+            if next_mask is not None:
+                self.hits += 1
+                return next_mask
+
+        self.misses += 1
+        succ = self._succ[a]
+        next_mask = 0
+        m = mask
+        while m:
+            low = m & -m
+            next_mask |= succ[low.bit_length() - 1]
+            m ^= low
+        row[a] = next_mask
+        return next_mask
+
+    def subset(self, mask):
+        return _mask_to_set(self.names, mask)
+
+    def accepts(self, string):
+        mask = self.start
+        for symbol in string:
+            mask = self.step(mask, symbol)
+            if not mask:
+                return False
+        return bool(mask & self.final_mask)
+
+    def match_stream(self, strings):
+        for string in strings:
+            yield self.accepts(string)
+
+    def accepts_many(self, strings):
+        return [self.accepts(string) for string in strings]
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'cached': len(self._cache),
+        }
+
+
+def _find(parent, b):
+    '''Корень b в лесе непересекающихся множеств parent (со сжатием путей).'''
+    root = b
+    while root in parent:
+        root = parent[root]
+    while b != root:
+        parent[b], b = root, parent[b]
+    return root
+
+
+def _csr_inverse(targets, n, k):
+    '''Обратный индекс полной таблицы targets из n строк (см. _inverse_index).'''
+    inv_start = array('i', [0]) * (k * (n + 1))
+    for s in range(n):
+        row = s * k
+        for a in range(k):
+            inv_start[a * (n + 1) + targets[row + a] + 1] += 1
+    for a in range(k):
+        offset = a * (n + 1)
+        for t in range(n):
+            inv_start[offset + t + 1] += inv_start[offset + t]
+
+    inv = array('i', [0]) * (k * n)
+    fill = array('i', inv_start)
+    for s in range(n):
+        row = s * k
+        for a in range(k):
+            pos = a * (n + 1) + targets[row + a]
+            inv[a * n + fill[pos]] = s
+            fill[pos] += 1
+    return inv_start, inv
+
+
+def _valmari(n, final, tails, labels, heads):
+    '''Уточнение по Валмари–Лехтинену для переходов tails[i] --labels[i]--> heads[i].
+
+    Уточняются два разбиения: состояний (блоки) и переходов (связки, по одной
+    на символ в начале). Каждый новый блок и каждая связка служат разделителем
+    один раз; split() всегда отделяет меньшую часть. Возвращает разбиение
+    состояний.'''
+    into = [[] for _ in range(n)]      # номера переходов, ведущих в состояние
+    for i, t in enumerate(heads):
+        into[t].append(i)
+
+    blocks = _Partition(n)
+    for s in range(n):
+        if final[s]:
+            blocks.mark(s)
+    blocks.split(smaller_new=True)
+    cords = _Partition.grouped(labels)
+
+    b, c = 1, 0
+    while c < len(cords.first):
+        for i in cords.elems[cords.first[c]:cords.past[c]]:
+            blocks.mark(tails[i])
+        blocks.split(smaller_new=True)
+        c += 1
+        while b < len(blocks.first):
+            for s in blocks.elems[blocks.first[b]:blocks.past[b]]:
+                for i in into[s]:
+                    cords.mark(i)
+            cords.split(smaller_new=True)
+            b += 1
+    return blocks
+
+
+def _brzozowski(fsm, stats=None, limit=None):
+    '''Минимизация двойным обращением: det(rev(det(rev(A)))).
+
+    Первое построение подмножеств может расти экспоненциально; при limit оно
+    прерывается, как только подмножеств больше limit, и возвращается None.
+    Второе не больше минимального ДКА и не ограничивается.'''
+    reversed_dfa = fsm.reverse()._determinize(stats=stats, limit=limit)
+    if reversed_dfa is None:
+        return None
+    dfa = reversed_dfa.to_fsm().reverse()._determinize(stats=stats)
+    dfa = dfa.remove_unreachable_states()
+    dfa.states = list(range(len(dfa)))
+    return dfa
+
+
+_MIN_PARALLEL_FRONTIER = 256   # меньший фронт дешевле раскрыть в текущем процессе
+_worker_succ = None
+
+
+def _init_subset_worker(succ):
+    global _worker_succ
+    _worker_succ = succ
+
+
+def _expand_subsets(masks, succ=None):
+    '''Для каждой маски подмножества — кортеж масок-последователей по всем символам.'''
+    if succ is None:
+        succ = _worker_succ
+    rows = []
+    for mask in masks:
+        row = []
+        for targets in succ:
+            next_mask = 0
+            m = mask
+            while m:
+                low = m & -m
+                next_mask |= targets[low.bit_length() - 1]
+                m ^= low
+            row.append(next_mask)
+        rows.append(tuple(row))
+    return rows
+
+
+def _determinize_parallel(names, symbols, start, succ, final_mask, workers):
+    '''Построение подмножеств по уровням обхода в ширину.
+
+    Фронт уровня делится на куски и раскрывается процессами пула; новые
+    подмножества отбираются по единому словарю масок в главном процессе,
+    после чего строки переходов собираются в одну таблицу.'''
+    subset_index = {start: 0}
+    # multiprocessing заметно удлиняет импорт модуля, поэтому — только здесь
+    from concurrent.futures import ProcessPoolExecutor
+
+    subsets = [start]
+    rows = []
+    frontier = [start]
+    with ProcessPoolExecutor(workers, initializer=_init_subset_worker,
+                             initargs=(succ,)) as pool:
+        while frontier:
+            if len(frontier) < _MIN_PARALLEL_FRONTIER:
+                level = _expand_subsets(frontier, succ)
+            else:
+                size = -(-len(frontier) // (workers * 4))
+                chunks = [frontier[i:i + size] for i in range(0, len(frontier), size)]
+                level = [row for chunk in pool.map(_expand_subsets, chunks) for row in chunk]
+            frontier = []
+            for row in level:
+                for mask in row:
+                    if mask and mask not in subset_index:
+                        subset_index[mask] = len(subsets)
+                        subsets.append(mask)
+                        frontier.append(mask)
+            rows.extend(level)
+
+    table = array('i', (subset_index[mask] if mask else -1 for row in rows for mask in row))
+    final = bytearray(1 if mask & final_mask else 0 for mask in subsets)
+    states = [_mask_to_set(names, mask) for mask in subsets]
+    return CompiledDFA(states, symbols, table, 0, final)
+
+
+def _epsilon_closures(n, epsilon):
+    '''ε-замыкания всех n состояний в виде масок.
+
+    Граф ε-переходов сжимается по компонентам сильной связности (Тарьян,
+    итеративно); компоненты выходят в обратном топологическом порядке, так что
+    замыкание компоненты собирается один раз из уже готовых замыканий потомков.'''
+    closure = [1 << i for i in range(n)]
+    order = [-1] * n
+    low = [0] * n
+    on_stack = bytearray(n)
+    stack = []
+    counter = 0
+    for root in list(epsilon):
+        if order[root] >= 0:
+            continue
+        order[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = 1
+        work = [(root, 0)]
+        while work:
+            v, i = work[-1]
+            successors = epsilon.get(v, ())
+            if i < len(successors):
+                work[-1] = (v, i + 1)
+                w = successors[i]
+                if order[w] < 0:
+                    order[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = 1
+                    work.append((w, 0))
+                elif on_stack[w] and order[w] < low[v]:
+                    low[v] = order[w]
+                continue
+            work.pop()
+            if work:
+                u = work[-1][0]
+                if low[v] < low[u]:
+                    low[u] = low[v]
+            if low[v] != order[v]:
+                continue
+            members = []
+            mask = 0
+            while True:
+                w = stack.pop()
+                on_stack[w] = 0
+                members.append(w)
+                mask |= 1 << w
+                if w == v:
+                    break
+            for w in members:
+                for x in epsilon.get(w, ()):
+                    mask |= closure[x]
+            for w in members:
+                closure[w] = mask
+    return closure
+
+
+def _mask_to_set(names, mask):
+    result = []
+    while mask:
+        low = mask & -mask
+        result.append(names[low.bit_length() - 1])
+        mask ^= low
+    return frozenset(result)
+
+
+class _Partition:
+    '''Уточняемое разбиение множества 0..n-1.
+
+    Элементы блока b лежат подряд в elems[first[b]:past[b]], помеченные
+    элементы собираются в начале блока — до позиции mid[b]. После merge()
+    в elems могут оставаться позиции, не принадлежащие ни одному блоку.'''
+
+    def __init__(self, n):
+        self.elems = list(range(n))
+        self.loc = list(range(n))
+        self.block_of = [0] * n
+        self.first = [0]
+        self.past = [n]
+        self.mid = [0]
+        self.touched = []
+        self.free = []      # номера блоков, освобождённые merge()
+        self.spare = {}     # блок -> (его past, граница запаса пустых позиций за ним)
+
+    @classmethod
+    def grouped(cls, keys):
+        '''Начальное разбиение, в котором элементы с равным keys[e] образуют блок.'''
+        partition = cls(len(keys))
+        elems = sorted(range(len(keys)), key=keys.__getitem__)
+        partition.elems = elems
+        partition.first, partition.past, partition.mid = [], [], []
+        for i, e in enumerate(elems):
+            partition.loc[e] = i
+            if not i or keys[e] != keys[elems[i - 1]]:
+                if i:
+                    partition.past.append(i)
+                partition.first.append(i)
+                partition.mid.append(i)
+            partition.block_of[e] = len(partition.first) - 1
+        partition.past.append(len(elems))
+        return partition
+
+    def size(self, b):
+        return self.past[b] - self.first[b]
+
+    def add(self):
+        '''Добавляет новый элемент отдельным блоком, возвращает его номер.'''
+        e, i = len(self.loc), len(self.elems)
+        b = self._new_block()
+        self.elems.append(e)
+        self.loc.append(i)
+        self.block_of.append(b)
+        self.first[b] = self.mid[b] = i
+        self.past[b] = i + 1
+        return e
+
+    def _new_block(self):
+        if self.free:
+            return self.free.pop()
+        self.first.append(0)
+        self.past.append(0)
+        self.mid.append(0)
+        return len(self.first) - 1
+
+    def merge(self, b, c):
+        '''Объединяет блоки b и c (вне refine); возвращает номер общего блока.
+
+        Меньший блок дописывается вслед за большим: в конец elems или в запас
+        пустых позиций за большим блоком. Если места нет, большой блок
+        переносится в конец elems и получает запас своего размера, так что
+        слияние обходится в среднем в O(размера меньшего блока). Номер
+        меньшего блока освобождается, а elems сжимается, когда пустых позиций
+        становится слишком много.'''
+        if self.size(b) < self.size(c):
+            b, c = c, b
+        elems, loc, block_of = self.elems, self.loc, self.block_of
+        moved = elems[self.first[c]:self.past[c]]
+        end = self.past[b]
+        spare = self.spare.pop(b, None)
+        if end != len(elems) and (spare is None or spare[0] != end
+                                  or spare[1] - end < len(moved)):
+            self._move_to_end(b)
+            end = len(elems)
+            spare = end, end + self.size(b) + 2 * len(moved)
+            elems.extend([-1] * (spare[1] - end))
+        if end == len(elems):
+            elems.extend(moved)
+        else:
+            elems[end:end + len(moved)] = moved
+        for i, e in enumerate(moved, end):
+            loc[e] = i
+            block_of[e] = b
+        self.past[b] = end + len(moved)
+        if spare is not None and self.past[b] < spare[1]:
+            self.spare[b] = self.past[b], spare[1]
+        self.spare.pop(c, None)
+        self.first[c] = self.past[c] = self.mid[c] = 0
+        self.free.append(c)
+        if len(elems) > 4 * len(loc):
+            self._compact()
+        return b
+
+    def _move_to_end(self, b):
+        elems, loc = self.elems, self.loc
+        start = len(elems)
+        elems.extend(elems[self.first[b]:self.past[b]])
+        for i in range(start, len(elems)):
+            loc[elems[i]] = i
+        self.first[b] = self.mid[b] = start
+        self.past[b] = len(elems)
+
+    def _compact(self):
+        elems = []
+        for b in range(len(self.first)):
+            start = len(elems)
+            elems.extend(self.elems[self.first[b]:self.past[b]])
+            self.first[b] = self.mid[b] = start
+            self.past[b] = len(elems)
+        for i, e in enumerate(elems):
+            self.loc[e] = i
+        self.elems = elems
+        self.spare = {}
+
+    def mark(self, e):
+        b = self.block_of[e]
+        i, j = self.loc[e], self.mid[b]
+        if i < j:
+            return
+        if j == self.first[b]:
+            self.touched.append(b)
+        other = self.elems[j]
+        self.elems[i], self.elems[j] = other, e
+        self.loc[other], self.loc[e] = i, j
+        self.mid[b] = j + 1
+
+    def split(self, smaller_new=False):
+        '''Отделяет помеченные части блоков; возвращает пары (старый, новый) блок.
+
+        Обычно новым блоком становится помеченная часть; при smaller_new —
+        меньшая из двух частей.'''
+        result = []
+        elems, block_of = self.elems, self.block_of
+        for b in self.touched:
+            first, mid, past = self.first[b], self.mid[b], self.past[b]
+            if mid == past:
+                self.mid[b] = first
+                continue
+            if smaller_new and mid - first > past - mid:
+                start, end = mid, past
+                self.past[b] = mid
+                self.mid[b] = first
+            else:
+                start, end = first, mid
+                self.first[b] = self.mid[b] = mid
+            if self.free:
+                new = self.free.pop()
+                self.first[new] = self.mid[new] = start
+                self.past[new] = end
+            else:
+                new = len(self.first)
+                self.first.append(start)
+                self.past.append(end)
+                self.mid.append(start)
+            for i in range(start, end):
+                block_of[elems[i]] = new
+            result.append((b, new))
+        self.touched = []
+        return result
+
+    def smaller(self, old, new):
+        return new if self.size(new) <= self.size(old) else old
+
+    def refine(self, worklist, k, predecessors, stats=None):
+        '''Основной цикл Хопкрофта. worklist — блоки-разделители (изменяется),
+        predecessors(a, states) перечисляет состояния с переходом по символу a
+        в одно из states. Возвращает число расщеплений.'''
+        in_worklist = bytearray(len(self.elems))
+        for b in worklist:
+            in_worklist[b] = 1
+        elems, first, past = self.elems, self.first, self.past
+        splits = 0
+        while worklist:
+            if stats is not None and len(worklist) > stats.max_worklist:
+                stats.max_worklist = len(worklist)
+            b = worklist.pop()
+            in_worklist[b] = 0
+            splitter = elems[first[b]:past[b]]
+            for a in range(k):
+                for s in predecessors(a, splitter):
+                    self.mark(s)
+                for old, new in self.split():
+                    splits += 1
+                    b2 = new if in_worklist[old] else self.smaller(old, new)
+                    worklist.append(b2)
+                    in_worklist[b2] = 1
+        return splits
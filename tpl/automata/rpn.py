@@ -0,0 +1,658 @@
+import re
+from functools import lru_cache
+
+from ._optional import import_numpy
+
+transitions_rpn = {
+    ('q0', 'n', 'Z'): ('q0', 'none', 'n'),
+    ('q0', 'n', '+'): ('q0', 'none', 'n'),
+    ('q0', 'n', '-'): ('q0', 'none', 'n'),
+    ('q0', 'n', '*'): ('q0', 'none', 'n'),
+    ('q0', 'n', '/'): ('q0', 'none', 'n'),
+    ('q0', 'n', '('): ('q0', 'none', 'n'),
+
+    ('q0', '(', 'Z'): ('q0', 'push:(', ''),
+    ('q0', '(', '+'): ('q0', 'push:(', ''),
+    ('q0', '(', '-'): ('q0', 'push:(', ''),
+    ('q0', '(', '*'): ('q0', 'push:(', ''),
+    ('q0', '(', '/'): ('q0', 'push:(', ''),
+    ('q0', '(', '('): ('q0', 'push:(', ''),
+
+    ('q0', ')', '('): ('q0', 'pop', ''),
+    ('q0', ')', '+'): ('q_(', 'pop', '+'),
+    ('q0', ')', '-'): ('q_(', 'pop', '-'),
+    ('q0', ')', '*'): ('q_(', 'pop', '*'),
+    ('q0', ')', '/'): ('q_(', 'pop', '/'),
+
+    ('q_(', '', '('): ('q0', 'pop', ''),
+    ('q_(', '', '+'): ('q_(', 'pop', '+'),
+    ('q_(', '', '-'): ('q_(', 'pop', '-'),
+    ('q_(', '', '*'): ('q_(', 'pop', '*'),
+    ('q_(', '', '/'): ('q_(', 'pop', '/'),
+
+    ('q0', '+', 'Z'): ('q0', 'push:+', ''),
+    ('q0', '+', '('): ('q0', 'push:+', ''),
+
+    ('q0', '+', '+'): ('q_+', 'pop', '+'),
+    ('q0', '+', '-'): ('q_+', 'pop', '-'),
+    ('q0', '+', '*'): ('q_+', 'pop', '*'),
+    ('q0', '+', '/'): ('q_+', 'pop', '/'),
+
+    ('q_+', '', 'Z'): ('q0', 'push:+', ''),
+    ('q_+', '', '('): ('q0', 'push:+', ''),
+    ('q_+', '', '+'): ('q_+', 'pop', '+'),
+    ('q_+', '', '-'): ('q_+', 'pop', '-'),
+    ('q_+', '', '*'): ('q_+', 'pop', '*'),
+    ('q_+', '', '/'): ('q_+', 'pop', '/'),
+
+    ('q0', '-', 'Z'): ('q0', 'push:-', ''),
+    ('q0', '-', '('): ('q0', 'push:-', ''),
+
+    ('q0', '-', '+'): ('q_-', 'pop', '+'),
+    ('q0', '-', '-'): ('q_-', 'pop', '-'),
+    ('q0', '-', '*'): ('q_-', 'pop', '*'),
+    ('q0', '-', '/'): ('q_-', 'pop', '/'),
+
+    ('q_-', '', 'Z'): ('q0', 'push:-', ''),
+    ('q_-', '', '('): ('q0', 'push:-', ''),
+    ('q_-', '', '+'): ('q_-', 'pop', '+'),
+    ('q_-', '', '-'): ('q_-', 'pop', '-'),
+    ('q_-', '', '*'): ('q_-', 'pop', '*'),
+    ('q_-', '', '/'): ('q_-', 'pop', '/'),
+
+    ('q0', '*', 'Z'): ('q0', 'push:*', ''),
+    ('q0', '*', '('): ('q0', 'push:*', ''),
+    ('q0', '*', '+'): ('q0', 'push:*', ''),
+    ('q0', '*', '-'): ('q0', 'push:*', ''),
+
+    ('q0', '*', '*'): ('q_*', 'pop', '*'),
+    ('q0', '*', '/'): ('q_*', 'pop', '/'),
+
+    ('q_*', '', 'Z'): ('q0', 'push:*', ''),
+    ('q_*', '', '('): ('q0', 'push:*', ''),
+    ('q_*', '', '+'): ('q0', 'push:*', ''),
+    ('q_*', '', '-'): ('q0', 'push:*', ''),
+    ('q_*', '', '*'): ('q_*', 'pop', '*'),
+    ('q_*', '', '/'): ('q_*', 'pop', '/'),
+
+    ('q0', '/', 'Z'): ('q0', 'push:/', ''),
+    ('q0', '/', '('): ('q0', 'push:/', ''),
+    ('q0', '/', '+'): ('q0', 'push:/', ''),
+    ('q0', '/', '-'): ('q0', 'push:/', ''),
+
+    ('q0', '/', '*'): ('q_/', 'pop', '*'),
+    ('q0', '/', '/'): ('q_/', 'pop', '/'),
+
+    ('q_/', '', 'Z'): ('q0', 'push:/', ''),
+    ('q_/', '', '('): ('q0', 'push:/', ''),
+    ('q_/', '', '+'): ('q0', 'push:/', ''),
+    ('q_/', '', '-'): ('q0', 'push:/', ''),
+    ('q_/', '', '*'): ('q_/', 'pop', '*'),
+    ('q_/', '', '/'): ('q_/', 'pop', '/'),
+
+    ('q0', '', 'Z'): ('qf', 'pop', ''),
+    ('q0', '', '+'): ('q_pop_all', 'pop', '+'),
+    ('q0', '', '-'): ('q_pop_all', 'pop', '-'),
+    ('q0', '', '*'): ('q_pop_all', 'pop', '*'),
+    ('q0', '', '/'): ('q_pop_all', 'pop', '/'),
+
+    ('q_pop_all', '', 'Z'): ('qf', 'pop', ''),
+    ('q_pop_all', '', '+'): ('q_pop_all', 'pop', '+'),
+    ('q_pop_all', '', '-'): ('q_pop_all', 'pop', '-'),
+    ('q_pop_all', '', '*'): ('q_pop_all', 'pop', '*'),
+    ('q_pop_all', '', '/'): ('q_pop_all', 'pop', '/'),
+}
+
+# transitions_lang = {
+#     ('q0', 'a', 'Z'): ('q1', 'none', ''),
+#     ('q1', 'a', 'Z'): ('q2', 'none', ''),
+#     ('q2', 'a', 'Z'): ('q3', 'none', ''),
+#     ('q3', 'a', 'Z'): ('q2', 'none', ''),
+#     ('q2', 'b', 'Z'): ('q4', 'push:b', ''),
+#     ('q4', 'b', 'b'): ('q6', 'pop', ''),
+#     ('q6', 'b', 'Z'): ('q4', 'push:b', ''),
+#     ('q4', 'c', 'b'): ('q5', 'pop', ''),
+#     ('q5', 'c', 'b'): ('q5', 'pop', ''),
+#     ('q5', 'c', 'Z'): ('q5', 'none', ''),
+#     ('q4', '', 'b'): ('qf', 'none', ''),
+#     ('q5', '', 'Z'): ('qf', 'none', ''),
+#     ('q0', '', 'Z'): ('reject', 'none', ''),
+#     ('q0', 'b', 'Z'): ('reject', 'none', ''),
+#     ('q0', 'c', 'Z'): ('reject', 'none', ''),
+#     ('q1', 'b', 'Z'): ('reject', 'none', ''),
+#     ('q1', 'c', 'Z'): ('reject', 'none', ''),
+#     ('q2', 'c', 'Z'): ('reject', 'none', ''),
+#     ('q4', 'c', 'Z'): ('reject', 'none', ''),
+#     ('q4', '', 'Z'): ('reject', 'none', ''),
+#     ('q5', '', 'b'): ('reject', 'none', ''),
+#     ('q6', '', 'Z'): ('reject', 'none', ''),
+# }
+
+transitions_lang = {
+    ('q0', 'a', 'Z'): ('q0', 'push:a', 'a'),
+    ('q0', 'a', 'a'): ('q1', 'push:a', 'aa'),
+    ('q1', 'a', 'a'): ('q0', 'push:a', 'aa'),
+    ('q0', 'b', 'a'): ('q0', 'ε', 'bb'),
+    ('q0', 'b', 'Z'): ('q2', 'none', 'b'),
+    ('q2', '', 'Z'): ('qf', 'none', ''),
+    ('q2', 'c', 'Z'): ('q2', 'none', 'c'),
+}
+
+# пробелы пропускаются, затем число (в том числе десятичное) или
+# идентификатор, оператор или скобка, либо недопустимый символ — номер
+# сработавшей группы задаёт вид лексемы
+_SCANNER = re.compile(r'\s*(?:(\d+(?:\.\d*)?|\.\d+|[^\W\d]\w*)|([-+*/()])|(\S))')
+_OPERAND, _OPERATOR, _INVALID = 1, 2, 3
+
+def scan(expression):
+    '''Лениво выдаёт лексемы (тип, значение) за один проход регулярным
+    выражением. Числа, десятичные дроби и идентификаторы — операнды типа 'n'.'''
+    for match in _SCANNER.finditer(expression):
+        kind = match.lastindex
+        if kind == _OPERAND:
+            yield ('n', match[_OPERAND])
+        elif kind == _OPERATOR:
+            operator = match[_OPERATOR]
+            yield (operator, operator)
+        else:
+            raise ValueError(f"Недопустимый символ: {match[_INVALID]}")
+
+def tokenize(expression):
+    return list(scan(expression))
+
+def convert_to_rpn_verbose(expression):
+    print(f"\nВходное выражение: {expression}")
+    print("=" * 70)
+    print(f"{'Шаг':<4} {'Вход':<18} {'Состояние':<10} {'Стек':<25} {'Выход (ОПЗ)':<30}")
+    print("-" * 70)
+
+    try:
+        tokens = tokenize(expression)
+    except ValueError as e:
+        print(f"Ошибка: {e}")
+        return
+
+    state = 'q0'
+    stack = ['Z']
+    output = []
+    i = 0
+    step = 0
+
+    while True:
+        step += 1
+
+        if state == 'qf' and (not stack or stack == ['Z'] or len(stack) == 0):
+            stack_str = ' '.join(stack) if stack else 'Пусто'
+            output_str = ' '.join(output) if output else '(пусто)'
+            print(f"{step:<4} {'ГОТОВО':<18} {state:<10} {stack_str:<25} {output_str:<30}")
+            print("-" * 70)
+            result = ' '.join(output)
+            print(f"Результат в ОПЗ: {result}")
+            print(f"Выражение корректно → {result}")
+            return
+
+        if i < len(tokens):
+            symbol, actual = tokens[i]
+            input_str = f"{actual} (тип: {symbol})"
+            epsilon = False
+        else:
+            symbol = ''
+            actual = ''
+            input_str = "ε (конец)"
+            epsilon = True
+
+        top = stack[-1] if stack else None
+
+        key = (state, symbol, top) if top is not None else None
+        if key not in transitions_rpn and top is not None:
+            key = (state, '', top)
+            if key in transitions_rpn:
+                symbol = ''
+                actual = ''
+                input_str = "ε-переход"
+                epsilon = True
+
+        if key not in transitions_rpn or top is None and key is not None:
+            print(f"\nОшибка на шаге {step}:")
+            print(f"   Состояние: {state}, Вход: '{symbol}', Вершина стека: {top}")
+            print("   Нет подходящего перехода.")
+            print("   Вероятно, синтаксическая ошибка во выражении.")
+            return
+
+        new_state, action, out = transitions_rpn[key]
+
+        stack_str = ' '.join(stack) if stack else 'Пусто'
+        output_str = ' '.join(output) if output else '(пусто)'
+        print(f"{step:<4} {input_str:<18} {state:<10} {stack_str:<25} {output_str:<30}")
+
+        if out and out != 'none':
+            if out == 'n':
+                output.append(actual)
+            else:
+                output.append(out)
+
+        if action.startswith('push:'):
+            stack.append(action[5:])
+        elif action == 'pop':
+            if stack:
+                stack.pop()
+            else:
+                print("Критическая ошибка: pop из пустого стека")
+                return
+        elif action != 'none':
+            print(f"Неизвестное действие: {action}")
+            return
+
+        state = new_state
+        if not epsilon:
+            i += 1
+
+        if step > 1000:
+            print("Слишком много шагов — прерывание")
+            return
+
+_POP, _KEEP = -1, -2
+_TOKEN = object()  # выдать значение текущей лексемы
+_rpn_machine = None
+
+def _compile_machine(transitions):
+    '''Нумерует состояния, входные и магазинные символы автомата ОПЗ.
+
+    Переход (q, x, Z) хранится в table[(q * n_inputs + x) * n_stack + Z] как
+    номер действия или -1; входной символ 0 — ε (''). Действие — тройка
+    (новое состояние, что сделать со стеком, что выдать): символ стека для
+    push, _POP или _KEEP; None, _TOKEN (текущая лексема) или строка.'''
+    states = ['q0']
+    inputs = ['']
+    stack_symbols = ['Z']
+    for (state, char, top), (new_state, action, _) in transitions.items():
+        for name in (state, new_state):
+            if name not in states:
+                states.append(name)
+        if char not in inputs:
+            inputs.append(char)
+        symbols = [top] + ([action[5:]] if action.startswith('push:') else [])
+        for symbol in symbols:
+            if symbol not in stack_symbols:
+                stack_symbols.append(symbol)
+    if 'qf' not in states:
+        states.append('qf')
+
+    state_index = {state: i for i, state in enumerate(states)}
+    input_index = {char: i for i, char in enumerate(inputs)}
+    stack_index = {symbol: i for i, symbol in enumerate(stack_symbols)}
+    n_inputs, n_stack = len(inputs), len(stack_symbols)
+    table = [-1] * (len(states) * n_inputs * n_stack)
+    actions = []
+    for (state, char, top), (new_state, action, out) in transitions.items():
+        if action.startswith('push:'):
+            stack_action = stack_index[action[5:]]
+        elif action == 'pop':
+            stack_action = _POP
+        elif action == 'none':
+            stack_action = _KEEP
+        else:
+            raise ValueError(f"Неизвестное действие: {action}")
+        if not out or out == 'none':
+            out = None
+        elif out == 'n':
+            out = _TOKEN
+        key = (state_index[state] * n_inputs + input_index[char]) * n_stack + stack_index[top]
+        table[key] = len(actions)
+        actions.append((state_index[new_state], stack_action, out))
+    return states, inputs, stack_symbols, input_index, table, actions
+
+def convert_to_rpn(expression, trace=None):
+    '''Переводит выражение в ОПЗ тем же автоматом transitions_rpn, что и
+    convert_to_rpn_verbose, но без печати; возвращает список лексем выхода.
+
+    trace(шаг, состояние, лексема, стек, выход) вызывается перед каждым
+    переходом; лексема — '' для ε-перехода. При синтаксической ошибке —
+    ValueError.'''
+    global _rpn_machine
+    if _rpn_machine is None:
+        _rpn_machine = _compile_machine(transitions_rpn)
+    states, inputs, stack_symbols, input_index, table, actions = _rpn_machine
+    n_inputs, n_stack = len(inputs), len(stack_symbols)
+    final = states.index('qf')
+
+    tokens = tokenize(expression)
+    kinds = [input_index.get(kind, -1) for kind, _ in tokens]
+    state = 0
+    stack = [0]
+    output = []
+    i = 0
+    step = 0
+
+    while True:
+        if state == final and (not stack or stack == [0]):
+            return output
+        if not stack:
+            raise ValueError(f"Нет подходящего перехода: состояние {states[state]}, пустой стек")
+
+        base = state * n_inputs * n_stack + stack[-1]
+        action = table[base + kinds[i] * n_stack] if i < len(tokens) and kinds[i] >= 0 else -1
+        consumed = action >= 0
+        if not consumed:
+            action = table[base]
+        if action < 0:
+            symbol = tokens[i][1] if i < len(tokens) else 'ε'
+            raise ValueError(f"Нет подходящего перехода: состояние {states[state]}, "
+                             f"вход '{symbol}', вершина стека {stack_symbols[stack[-1]]}")
+
+        new_state, stack_action, out = actions[action]
+        if trace is not None:
+            step += 1
+            trace(step, states[state], tokens[i][1] if consumed else '',
+                  [stack_symbols[symbol] for symbol in stack], list(output))
+        if out is _TOKEN:
+            output.append(tokens[i][1])
+        elif out is not None:
+            output.append(out)
+        if stack_action >= 0:
+            stack.append(stack_action)
+        elif stack_action == _POP:
+            stack.pop()
+        state = new_state
+        if consumed:
+            i += 1
+
+_OPERATORS = {
+    '+': lambda left, right: left + right,
+    '-': lambda left, right: left - right,
+    '*': lambda left, right: left * right,
+    '/': lambda left, right: left / right,
+}
+_PRECEDENCE = {'+': 1, '-': 1, '*': 2, '/': 2}
+_IDENTIFIER = re.compile(r'[^\W\d]\w*')
+
+def _number(token):
+    try:
+        return int(token)
+    except ValueError:
+        return float(token)
+
+def _rpn_error(rpn):
+    return ValueError(f"Некорректная запись ОПЗ: {' '.join(rpn)}")
+
+def evaluate_rpn(rpn, variables=None):
+    '''Вычисляет выражение в ОПЗ (список лексем, как из convert_to_rpn);
+    идентификаторы берутся из словаря variables.'''
+    stack = []
+    for token in rpn:
+        operator = _OPERATORS.get(token)
+        if operator is not None:
+            if len(stack) < 2:
+                raise _rpn_error(rpn)
+            right = stack.pop()
+            stack.append(operator(stack.pop(), right))
+        elif _IDENTIFIER.fullmatch(token):
+            if variables is None or token not in variables:
+                raise ValueError(f"Неизвестная переменная: {token}")
+            stack.append(variables[token])
+        else:
+            stack.append(_number(token))
+    if len(stack) != 1:
+        raise _rpn_error(rpn)
+    return stack[0]
+
+def compile_rpn(rpn):
+    '''Превращает ОПЗ в функцию от словаря переменных.
+
+    Выражение один раз собирается обратно в инфиксную запись со скобками
+    только там, где их требует приоритет, и компилируется в байт-код Python;
+    переменные становятся параметрами _v0, _v1, ... Если выражение слишком
+    глубоко для компилятора, функция вычисляет ОПЗ через evaluate_rpn.'''
+    rpn = tuple(rpn)
+    names = []
+    stack = []  # (текст, приоритет)
+    for token in rpn:
+        precedence = _PRECEDENCE.get(token)
+        if precedence is not None:
+            if len(stack) < 2:
+                raise _rpn_error(rpn)
+            right, right_precedence = stack.pop()
+            left, left_precedence = stack.pop()
+            if left_precedence < precedence:
+                left = f'({left})'
+            if right_precedence <= precedence:
+                right = f'({right})'
+            stack.append((f'{left} {token} {right}', precedence))
+        elif _IDENTIFIER.fullmatch(token):
+            if token not in names:
+                names.append(token)
+            stack.append((f'_v{names.index(token)}', 3))
+        else:
+            stack.append((repr(_number(token)), 3))
+    if len(stack) != 1:
+        raise _rpn_error(rpn)
+
+    parameters = ', '.join(f'_v{i}' for i in range(len(names)))
+    try:
+        function = eval(f'lambda {parameters}: {stack[0][0]}', {'__builtins__': {}})
+    except (SyntaxError, RecursionError, MemoryError):
+        return lambda variables=None: evaluate_rpn(rpn, variables)
+
+    def evaluate(variables=None):
+        try:
+            return function(*[variables[name] for name in names])
+        except (KeyError, TypeError):
+            for name in names:
+                if variables is None or name not in variables:
+                    raise ValueError(f"Неизвестная переменная: {name}") from None
+            raise
+    return evaluate
+
+@lru_cache(maxsize=4096)
+def _parse_normalized(expression):
+    return tuple(convert_to_rpn(expression))
+
+@lru_cache(maxsize=4096)
+def _compile_normalized(expression):
+    return compile_rpn(_parse_normalized(expression))
+
+def compile_expression(expression):
+    '''Функция из compile_rpn для выражения; результаты кэшируются (LRU) по
+    тексту с пробелами, сжатыми до одного, так что повторное вычисление
+    формулы не разбирает её заново.'''
+    return _compile_normalized(' '.join(expression.split()))
+
+compile_expression.cache_info = _compile_normalized.cache_info
+compile_expression.cache_clear = _compile_normalized.cache_clear
+
+def evaluate(expression, variables=None):
+    '''Вычисляет выражение при заданных значениях переменных.'''
+    return compile_expression(expression)(variables)
+
+def evaluate_rpn_columns(rpn, columns):
+    '''Вычисляет ОПЗ сразу для всех строк. columns — отображение имя → столбец
+    (словарь массивов, DataFrame); в стеке лежат целые массивы, поэтому каждая
+    операция — одно векторное действие NumPy, а не цикл по строкам. Деление
+    на ноль даёт inf/nan, как в NumPy. Результат — массив длины столбцов,
+    даже если выражение не зависит от переменных. Требует NumPy.'''
+    np = import_numpy()
+    if np is None:
+        raise ImportError("Для вычисления по столбцам нужен NumPy")
+    for token in rpn:
+        if _IDENTIFIER.fullmatch(token) and token not in columns:
+            raise ValueError(f"Неизвестная переменная: {token}")
+
+    ufuncs = {'+': np.add, '-': np.subtract, '*': np.multiply, '/': np.true_divide}
+    stack = []
+    for token in rpn:
+        ufunc = ufuncs.get(token)
+        if ufunc is not None:
+            if len(stack) < 2:
+                raise _rpn_error(rpn)
+            right = stack.pop()
+            stack.append(ufunc(stack.pop(), right))
+        elif _IDENTIFIER.fullmatch(token):
+            stack.append(np.asarray(columns[token]))
+        else:
+            stack.append(_number(token))
+    if len(stack) != 1:
+        raise _rpn_error(rpn)
+
+    # длина строк — по любому столбцу, даже не входящему в выражение
+    names = list(columns)
+    shape = np.shape(columns[names[0]]) if names else ()
+    result = np.asarray(stack[0])
+    if result.shape != shape:
+        result = np.broadcast_to(result, shape).copy()
+    return result
+
+def evaluate_columns(expression, columns):
+    '''evaluate_rpn_columns для выражения; ОПЗ берётся из того же LRU-кэша,
+    что и у compile_expression.'''
+    return evaluate_rpn_columns(_parse_normalized(' '.join(expression.split())), columns)
+
+def check_language(s):
+    print(f"\nПроверяем строку: → {s} ←")
+    print("=" * 80)
+    print(f"{'Шаг':<4} {'Ввод':<8} {'Сост.':<10} {'Стек':<25} {'Действие'}")
+    print("-" * 80)
+
+    state = 'q0'
+    stack = ['Z']
+    i = 0
+    step = 0
+
+    while True:
+        step += 1
+
+        if state == 'qf' and (not stack or stack == ['Z'] or len(stack) == 0):
+            print(f"{step:<4} {'ГОТОВО':<8} {'qf':<10} {'Пусто':<25} {'ПРИНЯТО!'}")
+            print("-" * 80)
+            return
+
+        sym = s[i] if i < len(s) else ''
+        inp = sym if i < len(s) else 'ε'
+
+        top = stack[-1]
+
+        key = (state, sym, top)
+        if key not in transitions_lang:
+            if i >= len(s):
+                key = (state, '', top)
+                if key in transitions_lang:
+                    inp = 'ε-переход'
+                else:
+                    key = None
+            else:
+                key = None
+
+        if key not in transitions_lang:
+            print(f"{step:<4} {inp:<8} {state:<10} {' '.join(stack):<25} {'НЕТ ПЕРЕХОДА → ОТКЛОНЕНО'}")
+            print("-" * 80)
+            return
+
+        new_state, action, _ = transitions_lang[key]
+        comment = "ничего"
+        if action.startswith('push:'):
+            comment = f"push {action[5:]}"
+        elif action == 'ε':
+            comment = "ε"
+
+        print(f"{step:<4} {inp:<8} {state}→{new_state:<5} {' '.join(stack):<25} {comment}")
+
+        if action.startswith('push:'):
+            stack.append(action[5:])
+        elif action == 'ε':
+            if stack and stack[-1] != 'Z':
+                stack.pop()
+
+        state = new_state
+        if sym:
+            i += 1
+
+_lang_machine = None
+
+def _compile_lang(transitions):
+    '''Нумерует автомат transitions_lang для check_many. Стек такого автомата —
+    Z и над ним серия одного символа, поэтому он хранится счётчиком, а вершина
+    — это 0 (Z) или 1 (символ). Переход (q, x, вершина) хранится в
+    table[(q * n_inputs + x) * 2 + вершина]; вход 0 — конец цепочки ('').
+    Действие — (новое состояние, +1 — push, -1 — снять символ, 0 — ничего).'''
+    states = ['q0']
+    inputs = ['']
+    pushed = {action[5:] for _, action, _ in transitions.values() if action.startswith('push:')}
+    tops = {top for _, _, top in transitions} - {'Z'}
+    if len(pushed | tops) > 1:
+        raise ValueError("Стек автомата должен состоять из Z и одного символа")
+    for (state, char, top), (new_state, action, _) in transitions.items():
+        for name in (state, new_state):
+            if name not in states:
+                states.append(name)
+        if char not in inputs:
+            inputs.append(char)
+
+    state_index = {state: i for i, state in enumerate(states)}
+    input_index = {char: i for i, char in enumerate(inputs) if i}
+    n_inputs = len(inputs)
+    table = [-1] * (len(states) * n_inputs * 2)
+    actions = []
+    for (state, char, top), (new_state, action, _) in transitions.items():
+        if action.startswith('push:'):
+            delta = 1
+        elif action == 'ε':
+            delta = -1
+        else:
+            delta = 0
+        key = (state_index[state] * n_inputs + inputs.index(char)) * 2 + (top != 'Z')
+        table[key] = len(actions)
+        actions.append((state_index[new_state], delta))
+    return states, input_index, n_inputs, table, actions
+
+def check_many(strings):
+    '''Проверяет набор строк автоматом transitions_lang так же, как
+    check_language, но без печати; возвращает список bool.
+
+    Число ε-переходов в конце строки ограничено: за (высота стека + 1) *
+    (число состояний) * 2 шагов автомат без ε-цикла либо примет строку, либо
+    остановится, поэтому более долгий прогон считается циклом и отказом.'''
+    global _lang_machine
+    if _lang_machine is None:
+        _lang_machine = _compile_lang(transitions_lang)
+    states, input_index, n_inputs, table, actions = _lang_machine
+    final = states.index('qf') if 'qf' in states else -1
+    get = input_index.get
+    results = []
+
+    for s in strings:
+        state = 0
+        count = 0
+        accepted = None
+        for char in s:
+            if state == final and not count:
+                accepted = True
+                break
+            x = get(char)
+            action = table[(state * n_inputs + x) * 2 + (count > 0)] if x is not None else -1
+            if action < 0:
+                accepted = False
+                break
+            state, delta = actions[action]
+            if delta > 0:
+                count += 1
+            elif delta and count:
+                count -= 1
+
+        if accepted is None:
+            # конец строки: дальше только ε-переходы
+            limit = (count + 1) * len(states) * 2
+            while True:
+                if state == final and not count:
+                    accepted = True
+                    break
+                action = table[state * n_inputs * 2 + (count > 0)]
+                limit -= 1
+                if action < 0 or limit < 0:
+                    accepted = False
+                    break
+                state, delta = actions[action]
+                if delta > 0:
+                    count += 1
+                elif delta and count:
+                    count -= 1
+        results.append(accepted)
+    return results
@@ -0,0 +1,150 @@
+import io
+import itertools
+import random
+import unittest
+
+from automata.dpda import EPSILON, DPDA
+
+STACK_SYMBOLS = 'Zab'
+
+# a^n b^n (n >= 1): после снятия всех a ε-переход в допускающее q2
+BALANCED = {
+    ('q0', 'a', 'Z'): ('q0', 'aZ'),
+    ('q0', 'a', 'a'): ('q0', 'aa'),
+    ('q0', 'b', 'a'): ('q1', EPSILON),
+    ('q1', 'b', 'a'): ('q1', EPSILON),
+    ('q1', EPSILON, 'Z'): ('q2', 'Z'),
+}
+
+
+def reference_accepts(dpda, string, limit=500):
+    """Прямое моделирование по словарю переходов; None — шаги не кончились за limit"""
+    transitions = dpda.transitions
+    state, stack, i = dpda.start_state, [dpda.start_stack], 0
+    for _ in range(limit):
+        if i == len(string) and state in dpda.final_states:
+            return True
+        if not stack:
+            return False
+        if i < len(string) and (state, string[i], stack[-1]) in transitions:
+            key = (state, string[i], stack[-1])
+            i += 1
+        elif (state, EPSILON, stack[-1]) in transitions:
+            key = (state, EPSILON, stack[-1])
+        else:
+            return False
+        state, replacement = transitions[key]
+        stack.pop()
+        stack.extend(symbol for symbol in reversed(replacement) if symbol != EPSILON)
+    return None
+
+
+def random_dpda(rng):
+    """Случайный ДМП-автомат: у пары (состояние, вершина) либо ε-переход, либо
+    переходы по символам, поэтому ε-циклы, в том числе растущие, встречаются часто"""
+    states = [f'q{i}' for i in range(rng.randint(1, 4))]
+    transitions = {}
+    for state in states:
+        for top in STACK_SYMBOLS:
+            chars = [EPSILON] if rng.random() < 0.25 else [c for c in 'abc' if rng.random() < 0.6]
+            for char in chars:
+                length = rng.choice([0, 1, 1, 2, 2, 3])
+                replacement = ''.join(rng.choice(STACK_SYMBOLS) for _ in range(length))
+                transitions[(state, char, top)] = (rng.choice(states), replacement or EPSILON)
+    final = [state for state in states if rng.random() < 0.4]
+    return DPDA(transitions, 'q0', 'Z', final)
+
+
+def chunks(rng, string):
+    parts = []
+    while string:
+        size = rng.randint(1, 3)
+        parts.append(string[:size])
+        string = string[size:]
+    return parts
+
+
+class TestRandomDPDA(unittest.TestCase):
+    """Сверка с прямым моделированием на случайных автоматах"""
+
+    def test_matches_reference(self):
+        """accepts, accepts_many и stream дают тот же ответ, что и моделирование"""
+        rng = random.Random(0)
+        strings = [''.join(w) for length in range(6)
+                   for w in itertools.product('abc', repeat=length)]
+        loops = 0
+        for _ in range(100):
+            dpda = random_dpda(rng)
+            expected = []
+            for string in strings:
+                result = reference_accepts(dpda, string)
+                loops += result is None
+                expected.append(bool(result))
+            self.assertEqual([dpda.accepts(s)[0] for s in strings], expected)
+            self.assertEqual(dpda.accepts_many(iter(strings)), expected)
+            for string, accepted in zip(strings, expected):
+                run = dpda.stream()
+                for part in chunks(rng, string):
+                    run.feed(part)
+                self.assertEqual(run.finish()[0], accepted, string)
+        self.assertGreater(loops, 0)
+
+    def test_epsilon_cycle(self):
+        """Бесконечный ε-цикл — отказ с пояснением, а не зависание"""
+        dpda = DPDA({
+            ('q0', 'a', 'Z'): ('q1', 'Z'),
+            ('q1', EPSILON, 'Z'): ('q2', 'aZ'),
+            ('q2', EPSILON, 'a'): ('q2', 'aa'),
+        }, 'q0', 'Z', ['q0'])
+        self.assertEqual(dpda.accepts(''), (True, "Цепочка проходит"))
+        accepted, reason = dpda.accepts('a')
+        self.assertFalse(accepted)
+        self.assertIn("Бесконечный цикл", reason)
+        self.assertEqual(dpda.accepts_many(['a', '', 'ab']), [False, True, False])
+
+
+class TestLongInput(unittest.TestCase):
+    """Цепочки, требующие больше 1000 шагов"""
+
+    def test_long_balanced(self):
+        """a^n b^n при n = 3000 разбирается целиком"""
+        dpda = DPDA(BALANCED, 'q0', 'Z', ['q2'])
+        string = 'a' * 3000 + 'b' * 3000
+        self.assertEqual(dpda.accepts(string), (True, "Цепочка проходит"))
+        self.assertEqual(dpda.accepts_many([string, string + 'b', string[:-1]]),
+                         [True, False, False])
+        run = dpda.stream()
+        for i in range(0, len(string), 1000):
+            self.assertIsNone(run.feed(string[i:i + 1000]))
+        self.assertTrue(run.finish()[0])
+
+
+class TestStream(unittest.TestCase):
+    """Проверка цепочки, поступающей по частям"""
+
+    def test_reject_position_across_chunks(self):
+        """Позиция отказа считается от начала всей цепочки"""
+        dpda = DPDA(BALANCED, 'q0', 'Z', ['q2'])
+        run = dpda.stream()
+        self.assertIsNone(run.feed('aaab'))
+        self.assertIsNone(run.feed('bb'))
+        accepted, reason = run.feed('ba')
+        self.assertFalse(accepted)
+        self.assertIn("Позиция: 6", reason)
+        self.assertEqual(run.feed('b'), (accepted, reason))
+        self.assertEqual(run.finish(), (accepted, reason))
+
+    def test_multibyte_split(self):
+        """Многобайтовый символ, разрезанный между чтениями, декодируется целиком"""
+        transitions = {(state, char.replace('a', 'ж'), top.replace('a', 'ж')):
+                       (new_state, replacement.replace('a', 'ж'))
+                       for (state, char, top), (new_state, replacement) in BALANCED.items()}
+        dpda = DPDA(transitions, 'q0', 'Z', ['q2'])
+        data = ('ж' * 3 + 'b' * 3).encode('utf-8')
+        for chunk_size in (1, 3, 5):
+            self.assertTrue(dpda.accepts_stream(io.BytesIO(data), chunk_size)[0])
+            self.assertFalse(dpda.accepts_stream(io.BytesIO(data + b'b'), chunk_size)[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
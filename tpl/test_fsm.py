@@ -0,0 +1,184 @@
+import itertools
+import random
+import time
+import unittest
+from array import array
+
+from automata.fsm import EPSILON, BuildStats, CompiledDFA, FiniteStateMachine
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def nfa_accepts(fsm, string):
+    """Прямое моделирование НКА с ε-замыканиями"""
+    def closure(states):
+        states = set(states)
+        stack = list(states)
+        while stack:
+            for t in fsm.transitions.get((stack.pop(), EPSILON), []):
+                if t not in states:
+                    states.add(t)
+                    stack.append(t)
+        return states
+
+    current = closure({fsm.start_state})
+    for symbol in string:
+        current = closure({t for s in current for t in fsm.transitions.get((s, symbol), [])})
+    return bool(current & fsm.final_states)
+
+
+def random_fsm(rng, alphabet, deterministic):
+    n = rng.randint(1, 9)
+    transitions = {}
+    for s in range(n):
+        for a in alphabet:
+            if deterministic:
+                if rng.random() < 0.7:
+                    transitions[(s, a)] = [rng.randrange(n)]
+            else:
+                targets = [t for t in range(n) if rng.random() < 0.3 / max(1, n / 4)]
+                if targets:
+                    transitions[(s, a)] = targets
+        if not deterministic and rng.random() < 0.3:
+            targets = [t for t in range(n) if rng.random() < 0.3 / n]
+            if targets:
+                transitions[(s, EPSILON)] = targets
+    final = [s for s in range(n) if rng.random() < 0.3]
+    return FiniteStateMachine(range(n), alphabet, transitions, 0, final)
+
+
+def words(alphabet, max_length):
+    for length in range(max_length + 1):
+        for w in itertools.product(alphabet, repeat=length):
+            yield ''.join(w)
+
+
+class TestMinimization(unittest.TestCase):
+    """Перекрёстная проверка способов минимизации"""
+
+    def check_methods(self, fsm, alphabet, methods):
+        strings = list(words(alphabet, 4))
+        expected = [nfa_accepts(fsm, w) for w in strings]
+        reference = fsm.minimize('hopcroft').compile()
+        self.assertEqual([reference.accepts(w) for w in strings], expected)
+        for method in methods:
+            result = fsm.minimize(method).compile()
+            self.assertEqual(len(result), len(reference), method)
+            self.assertTrue(result.equivalent(reference)[0], method)
+
+    def test_random_automata(self):
+        """Хопкрофт, Валмари, Бжозовский и auto дают один минимальный ДКА"""
+        rng = random.Random(0)
+        for i in range(200):
+            fsm = random_fsm(rng, 'abc', deterministic=i % 2 == 0)
+            self.check_methods(fsm, 'abc', ['valmari', 'brzozowski', 'auto'])
+
+    def test_sparse(self):
+        """Разреженная минимизация (SparseDFA) совпадает с Хопкрофтом"""
+        rng = random.Random(1)
+        for _ in range(100):
+            fsm = random_fsm(rng, 'abcd', deterministic=True)
+            sparse = fsm.to_sparse().minimize().to_compiled()
+            reference = fsm.minimize('hopcroft').compile()
+            self.assertEqual(len(sparse), len(reference))
+            self.assertTrue(sparse.equivalent(reference)[0])
+
+    def test_large_alphabet_auto(self):
+        """auto для ДКА с большим алфавитом идёт через SparseDFA"""
+        rng = random.Random(2)
+        alphabet = [chr(0x100 + i) for i in range(40)]
+        for _ in range(20):
+            fsm = random_fsm(rng, alphabet, deterministic=True)
+            result = fsm.minimize().compile()
+            reference = fsm.minimize('hopcroft').compile()
+            self.assertEqual(len(result), len(reference))
+            self.assertTrue(result.equivalent(reference)[0])
+
+    def test_auto_avoids_reverse_blowup(self):
+        """auto не строит экспоненциальный det(rev(A)) для «16-й символ — a»"""
+        transitions = {(s, a): [s + 1] for s in range(15) for a in 'ab'}
+        transitions[(0, 'a')] = [1, 17]
+        transitions[(15, 'a')] = [16]
+        transitions[(16, 'a')] = [16]
+        transitions[(16, 'b')] = [16]
+        fsm = FiniteStateMachine(range(18), 'ab', transitions, 0, [16])
+        stats = BuildStats()
+        result = fsm.minimize(stats=stats)
+        self.assertEqual(len(result.states), 17)
+        self.assertLess(stats.peak_subsets, 100)
+
+    def test_incremental(self):
+        """IncrementalDFA.minimize после правок (в том числе с новыми
+        состояниями) даёт минимальный автомат"""
+        rng = random.Random(3)
+        for _ in range(100):
+            fsm = random_fsm(rng, 'ab', deterministic=True)
+            n = len(fsm.states) + 2
+            incremental = fsm.compile().incremental()
+            for _ in range(rng.randint(1, 6)):
+                op = rng.random()
+                if op < 0.5:
+                    incremental.add_transition(rng.randrange(n), rng.choice('ab'), rng.randrange(n))
+                elif op < 0.8:
+                    incremental.remove_transition(rng.randrange(n), rng.choice('ab'))
+                else:
+                    incremental.set_final(rng.randrange(n), rng.random() < 0.5)
+                result = incremental.minimize()
+                reference = incremental.to_compiled().minimize()
+                self.assertEqual(len(result), len(reference))
+                self.assertTrue(result.equivalent(reference)[0])
+
+    def test_incremental_edit_cost(self):
+        """Правка с minimize() обходится заметно дешевле полной минимизации"""
+        rng = random.Random(5)
+        n = 10000
+        table = array('i', (rng.randrange(n) for _ in range(2 * n)))
+        final = bytearray(rng.random() < 0.5 for _ in range(n))
+        dfa = CompiledDFA(list(range(n)), ['a', 'b'], table, 0, final)
+        incremental = dfa.incremental()
+        begin = time.perf_counter()
+        dfa.minimize('hopcroft')
+        full = time.perf_counter() - begin
+        edits = []
+        for _ in range(3):
+            begin = time.perf_counter()
+            incremental.add_transition(rng.randrange(n), rng.choice('ab'), rng.randrange(n))
+            result = incremental.minimize()
+            edits.append(time.perf_counter() - begin)
+        self.assertLess(min(edits), full / 3)
+        reference = incremental.to_compiled().minimize()
+        self.assertEqual(len(result), len(reference))
+        self.assertTrue(result.equivalent(reference)[0])
+
+
+class TestAcceptsMany(unittest.TestCase):
+    """Пакетная проверка цепочек"""
+
+    def check_batch(self, vectorize):
+        rng = random.Random(4)
+        for i in range(30):
+            dfa = random_fsm(rng, 'abc', deterministic=i % 2 == 0).compile()
+            strings = []
+            for length in (0, 3, 5):
+                for _ in range(80):
+                    w = ''.join(rng.choice('abcd') for _ in range(length))
+                    strings.append(w if rng.random() < 0.6 else rng.choice([list(w), tuple(w)]))
+            rng.shuffle(strings)
+            self.assertEqual(dfa.accepts_many(strings, vectorize),
+                             [dfa.accepts(w) for w in strings])
+
+    def test_scalar(self):
+        """Без векторизации ответы совпадают с accepts"""
+        self.check_batch(vectorize=False)
+
+    @unittest.skipIf(numpy is None, "нужен NumPy")
+    def test_vectorized_mixed_types(self):
+        """Векторный путь на смеси str, списков и кортежей совпадает с accepts"""
+        self.check_batch(vectorize=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+import contextlib
+import io
+import itertools
+import random
+import unittest
+
+from automata.rpn import (check_language, check_many, convert_to_rpn,
+                          convert_to_rpn_verbose, scan, tokenize)
+
+
+def verbose_rpn(expression):
+    """Результат convert_to_rpn_verbose: список лексем ОПЗ или None при ошибке"""
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        convert_to_rpn_verbose(expression)
+    marker = 'Выражение корректно → '
+    output = buffer.getvalue()
+    if marker not in output:
+        return None
+    return output.split(marker)[1].split()
+
+
+def reference_tokenize(expression):
+    """Исходный посимвольный разбор (только целые числа)"""
+    tokens = []
+    i = 0
+    while i < len(expression):
+        if expression[i].isspace():
+            i += 1
+            continue
+        if expression[i].isdigit():
+            num = ''
+            while i < len(expression) and expression[i].isdigit():
+                num += expression[i]
+                i += 1
+            tokens.append(('n', num))
+            continue
+        if expression[i] in '+-*/()':
+            tokens.append((expression[i], expression[i]))
+            i += 1
+            continue
+        raise ValueError(f"Недопустимый символ: {expression[i]}")
+    return tokens
+
+
+def outcome(function, expression):
+    try:
+        return function(expression)
+    except ValueError as error:
+        return str(error)
+
+
+class TestScanner(unittest.TestCase):
+    """Тесты лексического анализа"""
+
+    def test_matches_reference(self):
+        """Для целых чисел лексемы и ошибки совпадают с исходным разбором"""
+        rng = random.Random(0)
+        for _ in range(20000):
+            expression = ''.join(rng.choice('0123456789+-*/() \t#')
+                                 for _ in range(rng.randint(0, 15)))
+            self.assertEqual(outcome(tokenize, expression),
+                             outcome(reference_tokenize, expression), expression)
+
+    def test_decimals_and_identifiers(self):
+        """Десятичные дроби и идентификаторы — операнды типа n"""
+        self.assertEqual(tokenize('x1 + 3.25*(.5 - y_2) / 7.'), [
+            ('n', 'x1'), ('+', '+'), ('n', '3.25'), ('*', '*'), ('(', '('),
+            ('n', '.5'), ('-', '-'), ('n', 'y_2'), (')', ')'), ('/', '/'), ('n', '7.'),
+        ])
+
+    def test_lazy(self):
+        """scan выдаёт лексемы до того, как дойдёт до ошибки"""
+        tokens = scan('1 + $')
+        self.assertEqual(next(tokens), ('n', '1'))
+        self.assertEqual(next(tokens), ('+', '+'))
+        with self.assertRaises(ValueError):
+            next(tokens)
+
+
+class TestConvertToRpn(unittest.TestCase):
+    """Тесты тихого перевода в ОПЗ"""
+
+    def test_matches_verbose(self):
+        """На случайных выражениях результат совпадает с convert_to_rpn_verbose"""
+        rng = random.Random(0)
+        pieces = ['1', '23', '+', '-', '*', '/', '(', ')', ' ']
+        for _ in range(3000):
+            expression = ''.join(rng.choice(pieces) for _ in range(rng.randint(0, 12)))
+            try:
+                result = convert_to_rpn(expression)
+            except ValueError:
+                result = None
+            self.assertEqual(result, verbose_rpn(expression), expression)
+
+    def test_priorities(self):
+        """Приоритеты операций и скобки"""
+        self.assertEqual(convert_to_rpn('(1+2)*3-4/5'),
+                         ['1', '2', '+', '3', '*', '4', '5', '/', '-'])
+
+    def test_syntax_error(self):
+        """Синтаксическая ошибка — ValueError"""
+        with self.assertRaises(ValueError):
+            convert_to_rpn('1+)')
+
+    def test_trace(self):
+        """trace вызывается на каждом шаге, ε-шаги — с пустой лексемой"""
+        steps = []
+        convert_to_rpn('1+2', trace=lambda *step: steps.append(step))
+        self.assertEqual([step[0] for step in steps], list(range(1, len(steps) + 1)))
+        self.assertEqual(steps[0][1:], ('q0', '1', ['Z'], []))
+        self.assertEqual(steps[-1][2], '')
+
+
+class TestCheckMany(unittest.TestCase):
+    """Тесты пакетной проверки языка transitions_lang"""
+
+    def test_matches_check_language(self):
+        """Для всех строк над abc длины до 8 ответ совпадает с check_language"""
+        strings = [''.join(w) for length in range(9)
+                   for w in itertools.product('abc', repeat=length)]
+        expected = []
+        for s in strings:
+            buffer = io.StringIO()
+            with contextlib.redirect_stdout(buffer):
+                check_language(s)
+            expected.append('ПРИНЯТО' in buffer.getvalue())
+        self.assertEqual(check_many(strings), expected)
+
+    def test_foreign_symbols(self):
+        """Символы вне алфавита отклоняются"""
+        self.assertEqual(check_many(['bx', 'd', 'b']), [False, False, True])
+
+    def test_long_input(self):
+        """Длинные строки проверяются без ограничения на число шагов"""
+        self.assertEqual(check_many(['b' + 'c' * 100000]), [True])
+
+
+if __name__ == '__main__':
+    unittest.main()